@@ -4,39 +4,45 @@
 Run: python3 tests.py
 """
 
-import wafer_calculator as wc
+from collections import namedtuple
 
+import wafer_calculator as wc
 
-def assert_positive(value, label):
-    if value <= 0:
-        raise AssertionError(f"{label} expected > 0, got {value}")
+Case = namedtuple("Case", "wafer die_w die_h scribe edge flat notch")
 
 
 def run_calculation_cases():
     cases = [
-        dict(wafer=100, die_w=10, die_h=10, scribe=0.1, edge=3, flat=32.5, notch=0),
-        dict(wafer=150, die_w=20, die_h=15, scribe=0.1, edge=3, flat=47.5, notch=0),
-        dict(wafer=200, die_w=10, die_h=10, scribe=0.1, edge=3, flat=0, notch=1.0),
-        dict(wafer=300, die_w=10, die_h=10, scribe=0.1, edge=3, flat=0, notch=1.0),
+        Case(wafer=100, die_w=10, die_h=10, scribe=0.1, edge=3, flat=32.5, notch=0),
+        Case(wafer=150, die_w=20, die_h=15, scribe=0.1, edge=3, flat=47.5, notch=0),
+        Case(wafer=200, die_w=10, die_h=10, scribe=0.1, edge=3, flat=0, notch=1.0),
+        Case(wafer=300, die_w=10, die_h=10, scribe=0.1, edge=3, flat=0, notch=1.0),
     ]
 
-    for case in cases:
-        result = wc.calculate_dies(
-            case["wafer"],
-            case["die_w"],
-            case["die_h"],
-            case["scribe"],
-            case["edge"],
-            case["flat"],
-            case["notch"],
-            max_positions=0,
-            include_partial=True,
-        )
-
-        assert_positive(result["usable_radius"], "usable_radius")
-        assert result["full_dies"] >= 0
-        assert result["partial_dies"] >= 0
-        assert result["total_sites"] == result["full_dies"] + result["partial_dies"]
+    # Transpose the rows into one column per calculate_dies parameter
+    result = wc.calculate_dies_batch(*zip(*cases), max_positions=0, include_partial=True)
+
+    assert all(radius > 0 for radius in result.usable_radius), (
+        f"usable_radius expected > 0, got {result.usable_radius}"
+    )
+    assert all(count >= 0 for count in result.full_dies)
+    assert all(count >= 0 for count in result.partial_dies)
+    sums = [full + partial for full, partial in zip(result.full_dies, result.partial_dies)]
+    assert result.total_sites == sums
+
+
+def run_no_usable_area_case():
+    # Edge exclusion beyond the wafer radius, with a notch and with a flat
+    cases = [
+        ((20, 1, 1, 0.1, 12, 0, 1.0), {}),
+        ((20, 5, 5, 0.25, 20, 15.9, 0), {"include_partial": False, "align_y": True}),
+        ((20, 20, 5, 1, 20, 15.9, 0), {}),
+    ]
+    for args, options in cases:
+        result = wc.calculate_dies(*args, max_positions=0, **options)
+        assert result["usable_radius"] < 0
+        assert result["full_dies"] == 0 and result["partial_dies"] == 0, (args, result)
+        assert result["die_center_x"] == ()
 
 
 def run_partial_off_case():
@@ -44,7 +50,86 @@ def run_partial_off_case():
     assert result["partial_dies"] == 0
 
 
+def run_limited_positions_case():
+    limited = wc.calculate_dies(300, 2, 2, 0.1, 3, 0, 1.0, max_positions=1200)
+    full = wc.calculate_dies(300, 2, 2, 0.1, 3, 0, 1.0, max_positions=0)
+    assert limited["die_positions_limited"]
+    assert len(limited["die_center_x"]) == 1200
+    assert limited["full_dies"] == full["full_dies"]
+    assert limited["partial_dies"] == full["partial_dies"]
+
+
+def run_counts_only_case():
+    args = (150, 20, 15, 0.1, 3, 47.5, 0)
+    counts = wc.calculate_dies(*args, max_positions=0, return_positions=False)
+    full = wc.calculate_dies(*args, max_positions=0)
+    assert counts["die_center_x"] == ()
+    assert counts["full_dies"] == full["full_dies"]
+    assert counts["partial_dies"] == full["partial_dies"]
+
+
+def run_cache_case():
+    # Start from an empty cache so the counts do not depend on earlier cases
+    wc._calculate_dies.cache_clear()
+    first = wc.calculate_dies(100, 10, 10, 0.1, 3, 32.5, 0, max_positions=0)
+    first["full_dies"] = -1
+    second = wc.calculate_dies(100, 10, 10, 0.1, 3, 32.5, 0, max_positions=0)
+    assert second["full_dies"] > 0
+    info = wc._calculate_dies.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+    # A capped preview reuses the full scan cached above
+    capped = wc.calculate_dies(100, 10, 10, 0.1, 3, 32.5, 0, max_positions=10)
+    info = wc._calculate_dies.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+    assert len(capped["die_center_x"]) == 10
+
+
+def run_compact_positions_case():
+    result = wc.calculate_dies(100, 10, 10, 0.1, 3, 32.5, 0, max_positions=0)
+    payload = wc.compact_die_positions(result)
+    assert len(payload["die_center_x"]) == len(result["die_center_x"])
+    assert set(payload["die_full"]) <= {0, 1}
+    assert sum(payload["die_full"]) == result["full_dies"]
+    assert result["die_full"] and isinstance(result["die_full"][0], bool)
+
+
+def run_query_params_case():
+    defaults = wc.CalcParams.from_query({})
+    assert defaults.wafer_diameter == 100 and defaults.include_partial
+    assert not defaults.align_x and not defaults.align_y
+
+    query = {"wafer": "150", "die_width": "20", "die_height": "15", "flat_length": "47.5"}
+    result = wc.CalcParams.from_query(query).calculate(max_positions=0)
+    assert result["full_dies"] == wc.calculate_dies(150, 20, 15, 0.1, 3, 47.5, 0)["full_dies"]
+
+    for bad in ({"wafer": "1000"}, {"die_width": "0"}, {"scribe": "x"}):
+        try:
+            wc.CalcParams.from_query(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {bad}")
+
+
+def run_rate_limit_case():
+    handler = wc.RequestHandler.__new__(wc.RequestHandler)
+    wc.RequestHandler.rate_limit.clear()
+    wc.RequestHandler.rate_limit["10.0.0.1"] = {"start": 0, "count": 50}  # long expired
+    handler.client_address = ("10.0.0.2", 0)
+    assert not any(handler._rate_limited() for _ in range(10))
+    assert handler._rate_limited()
+    assert list(wc.RequestHandler.rate_limit) == ["10.0.0.2"]
+    wc.RequestHandler.rate_limit.clear()
+
+
 if __name__ == "__main__":
     run_calculation_cases()
+    run_no_usable_area_case()
     run_partial_off_case()
+    run_limited_positions_case()
+    run_counts_only_case()
+    run_cache_case()
+    run_compact_positions_case()
+    run_query_params_case()
+    run_rate_limit_case()
     print("All tests passed.")
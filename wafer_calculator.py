@@ -7,15 +7,21 @@ Then open http://localhost:5000 in your browser
 Algorithm: Centered grid placement with symmetry
 """
 
+import collections
+import functools
+import gzip
+import hashlib
+import json
 import math
 import os
+import queue
 import struct
+import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-import json
 import urllib.parse
 import urllib.request
-
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
 
 # SEMI standard wafer specifications
 SEMI_STANDARDS = {
@@ -35,6 +41,11 @@ MAX_DIE_SIZE = 200.0
 MAX_SCRIBE = 5.0
 MAX_EDGE_EXCLUSION = 20.0
 
+# Die site classifications returned by classify_die
+DIE_OUTSIDE = 0
+DIE_PARTIAL = 1
+DIE_FULL = 2
+
 
 def calculate_sagitta(radius, flat_length):
     """Calculate the sagitta (height of flat cut) from flat length.
@@ -67,6 +78,7 @@ def calculate_dies(
     include_partial=True,
     align_x=False,
     align_y=False,
+    return_positions=True,
 ):
     """Calculate the number of dies that fit on a wafer with symmetrical placement.
 
@@ -80,6 +92,11 @@ def calculate_dies(
     4. For each die position, check if all 4 corners fit within the usable circle
     5. Classify as full die (all corners inside) or partial (some corners inside)
 
+    The grid scan is memoized on every argument except max_positions, which
+    only truncates the returned columns, so a capped preview and a full
+    export of the same layout share one cache entry. Each call returns a
+    fresh top-level dict, but the die position columns are shared tuples.
+
     Args:
         wafer_diameter: Total wafer diameter in mm
         die_width: Width of each die in mm
@@ -88,10 +105,53 @@ def calculate_dies(
         edge_exclusion: Unusable edge width in mm
         flat_length: Length of wafer flat (for older wafers) in mm
         notch_depth: Depth of notch (for 200mm+ wafers) in mm
+        return_positions: If False, only counts and statistics are computed and
+            the die position columns are returned empty
 
     Returns:
-        Dictionary with die counts, positions, and statistics
+        Dictionary with die counts, statistics, and die positions as parallel
+        die_center_x / die_center_y / die_full columns (see compact_die_positions)
     """
+    result = _calculate_dies(
+        wafer_diameter,
+        die_width,
+        die_height,
+        scribe,
+        edge_exclusion,
+        flat_length,
+        notch_depth,
+        include_partial,
+        align_x,
+        align_y,
+        return_positions,
+    )
+    result = dict(result)
+
+    # Limit die positions in API response to prevent browser freezing
+    # Full statistics are kept, just limit the array for visualization
+    if return_positions and 0 < max_positions < result['total_die_positions']:
+        result['die_center_x'] = result['die_center_x'][:max_positions]
+        result['die_center_y'] = result['die_center_y'][:max_positions]
+        result['die_full'] = result['die_full'][:max_positions]
+        result['die_positions_limited'] = True
+    return result
+
+
+@functools.lru_cache(maxsize=256)
+def _calculate_dies(
+    wafer_diameter,
+    die_width,
+    die_height,
+    scribe,
+    edge_exclusion,
+    flat_length,
+    notch_depth,
+    include_partial,
+    align_x,
+    align_y,
+    return_positions,
+):
+    """Memoized body of calculate_dies; see calculate_dies for arguments."""
     wafer_radius = wafer_diameter / 2
     usable_radius = wafer_radius - edge_exclusion
     effective_width = die_width + scribe
@@ -112,11 +172,16 @@ def calculate_dies(
         flat_y = wafer_radius * 2
         usable_flat_y = usable_radius * 2
 
+    usable_radius_sq = usable_radius * usable_radius
+    half_w = effective_width / 2
+    half_h = effective_height / 2
+
     dies = 0
     partial = 0
-    die_positions = []
+    sites = []  # (row, col, center_x, center_y, is_full) for every accepted die
+    # The symmetry filter needs the accepted sites even for a counts-only scan
+    keep_sites = return_positions or sagitta > 0
     total_positions = 0
-    limit_enabled = max_positions > 0
 
     # SYMMETRICAL PLACEMENT ALGORITHM
     # Start from center and expand outward in both directions
@@ -129,56 +194,81 @@ def calculate_dies(
     x_offset = 0.5 if align_x else 0.0
     y_offset = 0.5 if align_y else 0.0
 
-    for row in range(-max_rows, max_rows + 1):
-        for col in range(-max_cols, max_cols + 1):
-            # Calculate die position - centered on the die
-            x = (col + x_offset) * effective_width
-            y = (row + y_offset) * effective_height
+    # Die centers along a row are the same for every row, so compute them once
+    cols = range(-max_cols, max_cols + 1)
+    col_centers = [(col + x_offset) * effective_width for col in cols]
 
+    # Without a flat or notch the flat bound sits at twice the radius and can
+    # never reject a corner inside the circle, so use the circle-only check.
+    if sagitta > 0:
+        classify = classify_die
+    else:
+        classify = classify_die_in_circle
+
+    # Hot-loop names bound to locals to avoid global and attribute lookups
+    outside = DIE_OUTSIDE
+    full = DIE_FULL
+    add_site = sites.append
+
+    # An edge exclusion that swallows the wafer leaves no usable area. The corner
+    # tests compare squared distances, which cannot tell a negative radius from
+    # a positive one, so no rows are scanned at all.
+    rows = range(-max_rows, max_rows + 1) if usable_radius > 0 else range(0)
+
+    for row in rows:
+        y = (row + y_offset) * effective_height
+
+        # A die can only touch the circle if its nearest edges do, so skip rows
+        # that are already out of reach and clip the rest to the columns whose
+        # nearest edge lies within the chord (one column of slack either side)
+        top = y - half_h
+        bottom = y + half_h
+        near_y_sq = min(top * top, bottom * bottom)
+        if near_y_sq > usable_radius_sq:
+            continue
+        reach = (half_w + math.sqrt(usable_radius_sq - near_y_sq)) / effective_width
+        first = max(-int(reach + x_offset) - 1, -max_cols) + max_cols
+        last = min(int(reach - x_offset) + 1, max_cols) + max_cols
+
+        for col, x in zip(cols[first:last + 1], col_centers[first:last + 1]):
             # Check if die fits within usable area
-            if die_intersects(x, y, effective_width, effective_height, usable_radius, usable_flat_y):
-                total_positions += 1
-                center_x = x
-                center_y = y
-                is_full = is_fully_inside(center_x, center_y, effective_width, effective_height, usable_radius, usable_flat_y)
-
-                if is_full:
-                    dies += 1
-                else:
-                    if not include_partial:
-                        continue
-                    partial += 1
-
-                if not limit_enabled or len(die_positions) < max_positions:
-                    die_positions.append({
-                        'x': x - effective_width / 2,  # Convert to top-left corner for drawing
-                        'y': y - effective_height / 2,
-                        'w': effective_width,
-                        'h': effective_height,
-                        'full': is_full,
-                        'center_x': x,
-                        'center_y': y
-                    })
-
-    # Enforce symmetry about center when a flat/notch is present
+            site = classify(x, y, half_w, half_h, usable_radius_sq, usable_flat_y)
+            if site == outside:
+                continue
+
+            total_positions += 1
+            is_full = site == full
+            if is_full:
+                dies += 1
+            else:
+                if not include_partial:
+                    continue
+                partial += 1
+
+            if keep_sites:
+                add_site((row, col, x, y, is_full))
+
+    # Enforce symmetry about center when a flat/notch is present.
+    # Centers sit at (index + offset) * pitch, so the mirror of a site is another
+    # grid index: -index without offset, -index - 1 with a half-pitch offset.
     if sagitta > 0:
-        center_lookup = {}
-        for die in die_positions:
-            key = (round(die['center_x'], 6), round(die['center_y'], 6))
-            center_lookup[key] = die
-
-        filtered_positions = []
-        for die in die_positions:
-            key = (round(die['center_x'], 6), round(die['center_y'], 6))
-            mirror = (-key[0], -key[1])
-            if key == (0.0, 0.0) or mirror in center_lookup:
-                filtered_positions.append(die)
-
-        die_positions = filtered_positions
-        total_positions = len(die_positions)
-        dies = sum(1 for die in die_positions if die['full'])
+        mirror_col_shift = 1 if align_x else 0
+        mirror_row_shift = 1 if align_y else 0
+        accepted = {(row, col) for row, col, _, _, _ in sites}
+        sites = [
+            site for site in sites
+            if (-site[0] - mirror_row_shift, -site[1] - mirror_col_shift) in accepted
+        ]
+        total_positions = len(sites)
+        dies = sum(1 for site in sites if site[4])
         partial = total_positions - dies
 
+    # Keep positions as parallel columns rather than one dict per die
+    if return_positions:
+        _, _, die_center_x, die_center_y, die_full = tuple(zip(*sites)) or ((),) * 5
+    else:
+        die_center_x = die_center_y = die_full = ()
+
     # Calculate statistics
     die_area = die_width * die_height
     usable_area = math.pi * usable_radius ** 2
@@ -187,18 +277,16 @@ def calculate_dies(
     # Theoretical maximum (square packing area / wafer area)
     theoretical_max = math.floor(usable_area / (effective_width * effective_height))
 
-    # Limit die positions in API response to prevent browser freezing
-    # Full statistics are kept, just limit the array for visualization
-    die_positions_limited = limit_enabled and total_positions > max_positions
-
     return {
         'full_dies': dies,
         'partial_dies': partial,
         'total_sites': dies + partial,
         'die_utilization': round(die_utilization, 1),
         'usable_area': round(usable_area, 1),
-        'die_positions': die_positions,
-        'die_positions_limited': die_positions_limited,
+        'die_center_x': die_center_x,
+        'die_center_y': die_center_y,
+        'die_full': die_full,
+        'die_positions_limited': False,
         'total_die_positions': total_positions,
         'usable_radius': usable_radius,
         'wafer_radius': wafer_radius,
@@ -211,53 +299,256 @@ def calculate_dies(
     }
 
 
-def die_intersects(cx, cy, w, h, radius, flat_y):
-    """Check if any part of the die intersects the usable wafer area.
+class BatchCounts(NamedTuple):
+    """Per-parameter-set columns returned by calculate_dies_batch."""
+
+    usable_radius: list
+    full_dies: list
+    partial_dies: list
+    total_sites: list
+
+
+def compact_die_positions(result):
+    """Prepare the die position columns of a calculate_dies result for the wire.
+
+    The /calculate response keeps the parallel die_center_x / die_center_y /
+    die_full columns rather than one object per die. Centres are rounded to
+    0.1 um (float noise such as 10.100000000000001 would otherwise dominate
+    the payload) and the full flags are sent as 0/1. Die size is the same for
+    every die and is read from effective_width and effective_height.
+
+    Args:
+        result: Dictionary returned by calculate_dies
+
+    Returns:
+        New dictionary with the compacted position columns
+    """
+    payload = dict(result)
+    payload['die_center_x'] = [round(x, 4) for x in result['die_center_x']]
+    payload['die_center_y'] = [round(y, 4) for y in result['die_center_y']]
+    payload['die_full'] = [int(full) for full in result['die_full']]
+    return payload
+
+
+def calculate_dies_batch(
+    wafer_diameters,
+    die_widths,
+    die_heights,
+    scribes,
+    edge_exclusions,
+    flat_lengths,
+    notch_depths,
+    **options,
+):
+    """Calculate die counts for several parameter sets in a single call.
+
+    The parameter sequences are consumed in lockstep, one calculation per index.
+    Only counts are collected, so positions are never built. Keyword options
+    (include_partial, align_x, align_y) are passed through to calculate_dies
+    for every entry.
+
+    Args:
+        wafer_diameters: Sequence of wafer diameters in mm
+        die_widths: Sequence of die widths in mm
+        die_heights: Sequence of die heights in mm
+        scribes: Sequence of scribe line widths in mm
+        edge_exclusions: Sequence of edge exclusion widths in mm
+        flat_lengths: Sequence of flat lengths in mm
+        notch_depths: Sequence of notch depths in mm
+
+    Returns:
+        BatchCounts with one list entry per parameter set
+    """
+    batch = BatchCounts([], [], [], [])
+    for params in zip(
+        wafer_diameters,
+        die_widths,
+        die_heights,
+        scribes,
+        edge_exclusions,
+        flat_lengths,
+        notch_depths,
+    ):
+        result = calculate_dies(*params, return_positions=False, **options)
+        for key, column in zip(batch._fields, batch):
+            column.append(result[key])
+    return batch
+
+
+def classify_die(cx, cy, half_w, half_h, radius_sq, flat_y):
+    """Classify a die site against the usable wafer area.
+
+    The partial-overlap and full-containment checks share the same corner
+    coordinates, so both are answered in one pass.
 
     Args:
         cx, cy: Die center coordinates
-        w, h: Die width and height
-        radius: Usable wafer radius
+        half_w, half_h: Half of the die width and height
+        radius_sq: Usable wafer radius squared
         flat_y: Maximum y-coordinate (bottom of usable area due to flat/notch)
 
     Returns:
-        True if any corner is within the usable circle and above the flat
+        DIE_FULL if all corners are strictly inside the usable area,
+        DIE_PARTIAL if any corner is inside or on the boundary, else DIE_OUTSIDE
     """
-    half_w = w / 2
-    half_h = h / 2
-    corners = [
-        (cx - half_w, cy - half_h),
-        (cx + half_w, cy - half_h),
-        (cx - half_w, cy + half_h),
-        (cx + half_h, cy + half_h)
-    ]
-    return any(
-        math.sqrt(x**2 + y**2) <= radius and y <= flat_y
-        for x, y in corners
-    )
+    top = cy - half_h
+    bottom = cy + half_h
+    left = cx - half_w
+    right = cx + half_w
+    left_sq = left * left
+    right_sq = right * right
+    top_sq = top * top
+    bottom_sq = bottom * bottom
+
+    # Conditional expressions rather than min()/max() keep builtin lookups and
+    # calls out of this per-site function
+    if left_sq < right_sq:
+        near_x_sq, far_x_sq = left_sq, right_sq
+    else:
+        near_x_sq, far_x_sq = right_sq, left_sq
+
+    # Full: the farthest corner is strictly inside and the die is above the flat
+    far_y_sq = bottom_sq if bottom_sq > top_sq else top_sq
+    if bottom < flat_y and far_x_sq + far_y_sq < radius_sq:
+        return DIE_FULL
+
+    # Partial: any corner inside the circle (boundary included) and not below the flat
+    if top <= flat_y and near_x_sq + top_sq <= radius_sq:
+        return DIE_PARTIAL
+    if bottom <= flat_y and near_x_sq + bottom_sq <= radius_sq:
+        return DIE_PARTIAL
+    return DIE_OUTSIDE
+
+
+def classify_die_in_circle(cx, cy, half_w, half_h, radius_sq, flat_y=None):
+    """Classify a die site against a usable area with no flat or notch.
+
+    Same result as classify_die whenever flat_y lies beyond the circle, with
+    the flat comparisons dropped.
+
+    Args:
+        cx, cy: Die center coordinates
+        half_w, half_h: Half of the die width and height
+        radius_sq: Usable wafer radius squared
+        flat_y: Ignored; accepted so both classifiers share a signature
+
+    Returns:
+        DIE_FULL, DIE_PARTIAL or DIE_OUTSIDE, as for classify_die
+    """
+    top = cy - half_h
+    bottom = cy + half_h
+    left = cx - half_w
+    right = cx + half_w
+    left_sq = left * left
+    right_sq = right * right
+    top_sq = top * top
+    bottom_sq = bottom * bottom
+
+    if left_sq < right_sq:
+        near_x_sq, far_x_sq = left_sq, right_sq
+    else:
+        near_x_sq, far_x_sq = right_sq, left_sq
+    if top_sq < bottom_sq:
+        near_y_sq, far_y_sq = top_sq, bottom_sq
+    else:
+        near_y_sq, far_y_sq = bottom_sq, top_sq
+
+    if far_x_sq + far_y_sq < radius_sq:
+        return DIE_FULL
+    if near_x_sq + near_y_sq <= radius_sq:
+        return DIE_PARTIAL
+    return DIE_OUTSIDE
+
+
+def _unit_circle_points(num_segments):
+    """Closed unit-circle polygon with Y flipped to the GDSII +Y-up convention."""
+    points = []
+    for i in range(num_segments):
+        angle = 2 * math.pi * i / num_segments
+        points.append((math.cos(angle), -math.sin(angle)))
+    points.append(points[0])  # Close the polygon
+    return tuple(points)
+
+
+# Circle approximation used for the wafer and usable edges in GDSII exports
+GDSII_UNIT_CIRCLE = _unit_circle_points(64)
+
+# BGNLIB/BGNSTR payload: simplified modification and access dates
+# (year, month, day, hour, minute, second), each packed as a 2-byte integer
+GDSII_TIMESTAMPS = struct.pack('>12h', *([2024, 1, 1, 0, 0, 0] * 2))
+
+
+def _gdsii_record(record_type, data_type, data):
+    """Write a GDSII record with proper header."""
+    length = 4 + len(data)  # 4 bytes for header
+    header = struct.pack('>HBB', length, record_type, data_type)
+    return header + data
+
 
+def _gdsii_string(s):
+    """Write an ASCII string padded to even length."""
+    if len(s) % 2 == 1:
+        s += '\x00'
+    return s.encode('ascii')
 
-def is_fully_inside(cx, cy, w, h, radius, flat_y):
-    """Check if die is completely within the usable area.
 
-    A die is "full" if all 4 corners are within the usable radius AND
-    the die has sufficient clearance from the edge (no corner touches boundary).
+def _gdsii_2byte_int(n):
+    """Write a 2-byte signed integer."""
+    return struct.pack('>h', n)
+
+
+def _gdsii_8byte_real(n):
+    """Write an 8-byte real (GDSII floating point format).
+
+    GDSII reals are sign * mantissa * 16^(exponent - 64) with a 56-bit
+    mantissa in [1/16, 1). The fields are taken straight from the IEEE-754
+    double: the binary exponent selects the hex exponent and its low two
+    bits shift the 53-bit significand into place, so no loop is needed.
     """
-    half_w = w / 2
-    half_h = h / 2
-    corners = [
-        (cx - half_w, cy - half_h),
-        (cx + half_w, cy - half_h),
-        (cx - half_w, cy + half_h),
-        (cx + half_h, cy + half_h)
-    ]
-    # All corners must be strictly inside (not touching the boundary)
-    # and above the flat line
-    for x, y in corners:
-        dist = math.sqrt(x**2 + y**2)
-        if dist >= radius or y >= flat_y:
-            return False
-    return True
+    if n == 0:
+        return b'\x00' * 8
+
+    bits = struct.unpack('>Q', struct.pack('>d', n))[0]
+    sign_bit = bits >> 63
+    exponent = ((bits >> 52) & 0x7FF) - 1023
+    significand = (bits & ((1 << 52) - 1)) | (1 << 52)
+
+    # Adjust for GDSII bias of 64
+    exp_byte = (exponent >> 2) + 1 + 64
+    mantissa = significand << (exponent & 3)
+
+    return struct.pack('>Q', (sign_bit << 63) | (exp_byte << 56) | mantissa)
+
+
+def _gdsii_prefix():
+    """Build the library and structure header records shared by every export."""
+    prefix = bytearray()
+
+    # HEADER record (version 5)
+    prefix.extend(_gdsii_record(0x00, 0x02, _gdsii_2byte_int(5)))
+
+    # BGNLIB - begin library (dates)
+    prefix.extend(_gdsii_record(0x01, 0x02, GDSII_TIMESTAMPS))
+
+    # LIBNAME
+    prefix.extend(_gdsii_record(0x02, 0x06, _gdsii_string('WAFER_LIB')))
+
+    # UNITS - user units and database units in meters
+    # User unit = 1 micrometer = 1e-6 meters, DB unit = 1 nanometer = 1e-9 meters
+    units_data = _gdsii_8byte_real(1e-6) + _gdsii_8byte_real(1e-9)
+    prefix.extend(_gdsii_record(0x03, 0x05, units_data))
+
+    # BGNSTR - begin structure
+    prefix.extend(_gdsii_record(0x05, 0x02, GDSII_TIMESTAMPS))
+
+    # STRNAME
+    prefix.extend(_gdsii_record(0x06, 0x06, _gdsii_string('WAFER_DIE_LAYOUT')))
+
+    return bytes(prefix)
+
+
+# HEADER, BGNLIB, LIBNAME, UNITS, BGNSTR and STRNAME never depend on the layout
+_GDSII_PREFIX = _gdsii_prefix()
 
 
 def generate_gdsii(data, layer_config):
@@ -277,162 +568,291 @@ def generate_gdsii(data, layer_config):
         data: Dictionary with wafer calculation results
 
     Returns:
-        Bytes containing the GDSII file
+        Bytearray containing the GDSII file. It is returned without a copy
+        to bytes, so a large layout is held in memory only once.
     """
     # Use 1 database unit = 1 nanometer (0.001 mm)
     # Scale factor: mm to database units
     DB_UNIT_NM = 1000000  # 1 mm = 1,000,000 nm
 
-    def write_record(record_type, data_type, data):
-        """Write a GDSII record with proper header."""
-        length = 4 + len(data)  # 4 bytes for header
-        header = struct.pack('>HBB', length, record_type, data_type)
-        return header + data
-
-    def write_string(s):
-        """Write an ASCII string padded to even length."""
-        if len(s) % 2 == 1:
-            s += '\x00'
-        return s.encode('ascii')
-
-    def write_2byte_int(n):
-        """Write a 2-byte signed integer."""
-        return struct.pack('>h', n)
-
-    def write_4byte_int(n):
-        """Write a 4-byte signed integer."""
-        return struct.pack('>i', n)
-
-    def write_8byte_real(n):
-        """Write an 8-byte real (GDSII floating point format)."""
-        # GDSII uses a custom floating point format
-        # For simplicity, we'll use a fixed user unit = 1 micrometer
-        # and database unit = 1 nanometer
-        # 8-byte real: exponent in upper bits, mantissa in lower
-        # Simplified: encode as IEEE double with conversion
-        # Actually, GDSII uses: mantissa * 16^(exponent-64)
-        # For user units (1 um = 1000 nm), database units (1 nm)
-        # We'll encode 1.0e-9 for database unit in meters
-        if n == 0:
-            return b'\x00' * 8
-
-        # Find exponent such that mantissa is in [0.0625, 1.0)
-        abs_n = abs(n)
-        exponent = 0
-        while abs_n >= 1.0:
-            abs_n /= 16.0
-            exponent += 1
-        while abs_n < 0.0625:
-            abs_n *= 16.0
-            exponent -= 1
-
-        # Adjust for GDSII bias of 64
-        exp_byte = exponent + 64
-        # Mantissa is 7 bytes
-        mantissa = int(abs_n * (2 ** 56))
-
-        # Pack: sign bit (1), exponent (7), mantissa (56)
-        sign_bit = 0x80 if n < 0 else 0x00
-        result = struct.pack('>B', sign_bit | exp_byte)
-        result += struct.pack('>Q', mantissa)[1:]  # 7 bytes
-
-        return result
-
     def write_xy(points):
         """Write XY record with list of (x, y) tuples."""
-        data = b''
+        coords = []
         for x, y in points:
-            data += write_4byte_int(int(x * DB_UNIT_NM))
-            data += write_4byte_int(int(y * DB_UNIT_NM))
-        return write_record(0x10, 0x03, data)  # XY, 4-byte integer
+            coords.append(int(x * DB_UNIT_NM))
+            coords.append(int(y * DB_UNIT_NM))
+        data = struct.pack(f'>{len(coords)}i', *coords)
+        return _gdsii_record(0x10, 0x03, data)  # XY, 4-byte integer
 
-    def flip_y(points):
-        """Flip Y coordinates to match viewer orientation (+Y up)."""
-        return [(x, -y) for x, y in points]
+    gdsii = bytearray(_GDSII_PREFIX)
 
-    gdsii = b''
+    def add_boundary(layer, points, datatype=0):
+        """Add a GDSII BOUNDARY element with layer/datatype and XY points."""
+        gdsii.extend(_gdsii_record(0x08, 0x00, b''))
+        gdsii.extend(_gdsii_record(0x0D, 0x02, _gdsii_2byte_int(layer)))
+        gdsii.extend(_gdsii_record(0x0E, 0x02, _gdsii_2byte_int(datatype)))
+        gdsii.extend(write_xy(points))
+        gdsii.extend(_gdsii_record(0x11, 0x00, b''))
 
-    # HEADER record (version 5)
-    gdsii += write_record(0x00, 0x02, write_2byte_int(5))
+    # Create wafer edge polygon from the precomputed unit circle
+    wafer_radius = data['wafer_radius']
+    wafer_points = [(wafer_radius * x, wafer_radius * y) for x, y in GDSII_UNIT_CIRCLE]
+    add_boundary(layer_config['wafer_layer'], wafer_points, layer_config['wafer_datatype'])
 
-    # BGNLIB - begin library (dates)
-    now = [2024, 1, 1, 0, 0, 0]  # Simplified date
-    gdsii += write_record(0x01, 0x02, b''.join(write_2byte_int(x) for x in now * 2))
+    # Create usable edge polygon
+    usable_radius = data['usable_radius']
+    usable_points = [(usable_radius * x, usable_radius * y) for x, y in GDSII_UNIT_CIRCLE]
+    add_boundary(layer_config['usable_layer'], usable_points, layer_config['usable_datatype'])
+
+    # Add all dies as BOUNDARY elements. Every die record shares the same
+    # BOUNDARY/LAYER/DATATYPE/XY header and ENDEL trailer, so only the ten
+    # coordinates of the closed rectangle are packed per die.
+    die_prefix = (
+        _gdsii_record(0x08, 0x00, b'')
+        + _gdsii_record(0x0D, 0x02, _gdsii_2byte_int(layer_config['die_layer']))
+        + _gdsii_record(0x0E, 0x02, _gdsii_2byte_int(layer_config['die_datatype']))
+        + struct.pack('>HBB', 4 + 10 * 4, 0x10, 0x03)
+    )
+    die_suffix = _gdsii_record(0x11, 0x00, b'')
+    pack_die_xy = struct.Struct('>10i').pack
+
+    # Dies sit on a regular grid, so their edges repeat across rows and
+    # columns. Scale each distinct column and row to database units once.
+    die_w = data['effective_width']
+    die_h = data['effective_height']
+    half_w = die_w / 2
+    half_h = die_h / 2
+    center_xs = data['die_center_x']
+    center_ys = data['die_center_y']
+    x_edges = {}
+    for center_x in set(center_xs):
+        x1 = center_x - half_w
+        x2 = x1 + die_w
+        x_edges[center_x] = (int(x1 * DB_UNIT_NM), int(x2 * DB_UNIT_NM))
+    y_edges = {}
+    for center_y in set(center_ys):
+        y1 = center_y - half_h
+        y2 = y1 + die_h
+        y_edges[center_y] = (int(-y1 * DB_UNIT_NM), int(-y2 * DB_UNIT_NM))
+
+    for center_x, center_y in zip(center_xs, center_ys):
+        ix1, ix2 = x_edges[center_x]
+        iy1, iy2 = y_edges[center_y]
+
+        # 5-point polygon: top-left, top-right, bottom-right, bottom-left, close
+        gdsii.extend(die_prefix)
+        gdsii.extend(pack_die_xy(ix1, iy1, ix2, iy1, ix2, iy2, ix1, iy2, ix1, iy1))
+        gdsii.extend(die_suffix)
 
-    # LIBNAME
-    gdsii += write_record(0x02, 0x06, write_string('WAFER_LIB'))
+    # ENDSTR - end structure
+    gdsii.extend(_gdsii_record(0x07, 0x00, b''))
 
-    # UNITS - user units and database units in meters
-    # User unit = 1 micrometer = 1e-6 meters, DB unit = 1 nanometer = 1e-9 meters
-    units_data = write_8byte_real(1e-6) + write_8byte_real(1e-9)
-    gdsii += write_record(0x03, 0x05, units_data)
+    # ENDLIB - end library
+    gdsii.extend(_gdsii_record(0x04, 0x00, b''))
 
-    # BGNSTR - begin structure
-    gdsii += write_record(0x05, 0x02, b''.join(write_2byte_int(x) for x in now * 2))
+    return gdsii
 
-    # STRNAME
-    gdsii += write_record(0x06, 0x06, write_string('WAFER_DIE_LAYOUT'))
 
-    def add_boundary(layer, points, datatype=0):
-        """Add a GDSII BOUNDARY element with layer/datatype and XY points."""
-        nonlocal gdsii
-        gdsii += write_record(0x08, 0x00, b'')
-        gdsii += write_record(0x0D, 0x02, write_2byte_int(layer))
-        gdsii += write_record(0x0E, 0x02, write_2byte_int(datatype))
-        gdsii += write_xy(points)
-        gdsii += write_record(0x11, 0x00, b'')
-
-    # Create wafer edge polygon (circle approximated with 64 points)
-    wafer_radius = data['wafer_radius']
-    wafer_points = []
-    num_segments = 64
-    for i in range(num_segments):
-        angle = 2 * math.pi * i / num_segments
-        x = wafer_radius * math.cos(angle)
-        y = wafer_radius * math.sin(angle)
-        wafer_points.append((x, y))
-    wafer_points.append(wafer_points[0])  # Close the polygon
+# Styles not needed for first paint (toasts, modals, overlays, scrollbars).
+# The page links them as a preloaded stylesheet so they do not block rendering.
+DEFERRED_CSS = '''/* Toast Notifications */
+.toast-container {
+    position: fixed;
+    bottom: 48px;
+    right: 344px;
+    z-index: 1000;
+    display: flex;
+    flex-direction: column;
+    gap: 8px;
+}
 
-    add_boundary(layer_config['wafer_layer'], flip_y(wafer_points), layer_config['wafer_datatype'])
+.toast {
+    background: var(--bg-secondary);
+    border: 1px solid var(--border-color);
+    border-left: 3px solid var(--accent-blue);
+    border-radius: var(--radius);
+    padding: 12px 16px;
+    box-shadow: var(--shadow-lg);
+    min-width: 280px;
+}
 
-    # Create usable edge polygon
-    usable_radius = data['usable_radius']
-    usable_points = []
-    for i in range(num_segments):
-        angle = 2 * math.pi * i / num_segments
-        x = usable_radius * math.cos(angle)
-        y = usable_radius * math.sin(angle)
-        usable_points.append((x, y))
-    usable_points.append(usable_points[0])  # Close the polygon
-
-    add_boundary(layer_config['usable_layer'], flip_y(usable_points), layer_config['usable_datatype'])
-
-    # Add all dies as BOUNDARY elements
-    for die in data['die_positions']:
-        # Create 5-point polygon (4 corners + closing point)
-        x1 = die['x']
-        y1 = die['y']
-        x2 = die['x'] + die['w']
-        y2 = die['y'] + die['h']
-
-        die_points = [
-            (x1, -y1),  # top-left
-            (x2, -y1),  # top-right
-            (x2, -y2),  # bottom-right
-            (x1, -y2),  # bottom-left
-            (x1, -y1)   # close
-        ]
+.toast.success { border-left-color: var(--accent-green); }
+.toast.error { border-left-color: var(--accent-red); }
+.toast.warning { border-left-color: var(--accent-orange); }
+
+.modal {
+    width: 520px;
+    max-width: 92vw;
+    background: var(--bg-secondary);
+    border: 1px solid var(--border-color);
+    border-radius: var(--radius);
+    box-shadow: var(--shadow-lg);
+    padding: 18px;
+}
 
-        add_boundary(layer_config['die_layer'], die_points, layer_config['die_datatype'])
+.modal-header {
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    margin-bottom: 12px;
+}
 
-    # ENDSTR - end structure
-    gdsii += write_record(0x07, 0x00, b'')
+.modal-title {
+    font-size: 15px;
+    font-weight: 600;
+    color: var(--text-primary);
+}
 
-    # ENDLIB - end library
-    gdsii += write_record(0x04, 0x00, b'')
+.modal-body {
+    display: flex;
+    flex-direction: column;
+    gap: 12px;
+}
 
-    return gdsii
+.modal textarea {
+    min-height: 120px;
+    resize: vertical;
+    background: var(--bg-primary);
+    border: 1px solid var(--border-color);
+    color: var(--text-primary);
+    padding: 10px 12px;
+    border-radius: var(--radius-sm);
+    font-size: 13px;
+    font-family: var(--font-sans);
+}
 
+.modal-actions {
+    display: flex;
+    justify-content: flex-end;
+    gap: 8px;
+    margin-top: 12px;
+}
+
+.toast-title {
+    font-weight: 600;
+    font-size: 13px;
+    color: var(--text-primary);
+    margin-bottom: 4px;
+}
+
+.toast-message {
+    font-size: 12px;
+    color: var(--text-secondary);
+}
+
+@keyframes shake {
+    0%, 100% { transform: translate3d(0, 0, 0); }
+    25% { transform: translate3d(-5px, 0, 0); }
+    75% { transform: translate3d(5px, 0, 0); }
+}
+
+/* Tooltip */
+.tooltip {
+    position: absolute;
+    background: var(--bg-tertiary);
+    border: 1px solid var(--border-color);
+    border-radius: var(--radius-sm);
+    padding: 8px 12px;
+    font-size: 12px;
+    color: var(--text-primary);
+    pointer-events: none;
+    z-index: 1000;
+    box-shadow: var(--shadow);
+    display: none;
+}
+
+.tooltip.show {
+    display: block;
+}
+
+/* Coordinate overlay */
+.coord-overlay {
+    position: absolute;
+    top: 16px;
+    left: 16px;
+    background: rgba(26, 26, 46, 0.9);
+    border: 1px solid var(--border-color);
+    border-radius: var(--radius-sm);
+    padding: 8px 12px;
+    font-family: var(--font-mono);
+    font-size: 12px;
+    color: var(--text-secondary);
+    pointer-events: none;
+    will-change: auto;
+}
+
+/* The blur re-composites the canvas under the overlay; keep it to fine-pointer
+   devices where that cost is affordable */
+@media (hover: hover) and (pointer: fine) {
+    .coord-overlay {
+        backdrop-filter: blur(4px);
+    }
+}
+
+.coord-overlay [data-theme="light"] & {
+    background: rgba(255, 255, 255, 0.9);
+}
+
+/* Scrollbar styling */
+::-webkit-scrollbar {
+    width: 8px;
+    height: 8px;
+}
+
+::-webkit-scrollbar-track {
+    background: var(--bg-primary);
+}
+
+::-webkit-scrollbar-thumb {
+    background: var(--border-color);
+    border-radius: 4px;
+}
+
+::-webkit-scrollbar-thumb:hover {
+    background: var(--text-muted);
+}
+'''
+
+# KLayout .lyp parsing, only needed once the user imports a layer file. The page
+# loads it with a dynamic import() on first use instead of parsing it up front.
+LYP_PARSER_JS = '''// Only a handful of fields per <properties> block are needed, so the file is
+// scanned with regular expressions instead of being built into a DOM tree.
+const PROPERTIES_RE = /<properties>([\\s\\S]*?)<\\/properties>/g;
+const FIELD_RE = {
+    name: /<name>([^<]*)<\\/name>/,
+    layer: /<layer>([^<]*)<\\/layer>/,
+    datatype: /<datatype>([^<]*)<\\/datatype>/,
+    color: /<color>([^<]*)<\\/color>/,
+};
+
+const field = (block, key) => block.match(FIELD_RE[key])?.[1] || '';
+
+// Pick the wafer, usable-area and die layers out of a KLayout .lyp file,
+// matching by layer name first and falling back to position. Missing layers are null.
+export function parseLyp(xml) {
+    const layers = [];
+    for (const [, block] of xml.matchAll(PROPERTIES_RE)) {
+        const colorText = field(block, 'color');
+        layers.push({
+            name: field(block, 'name').toLowerCase(),
+            layer: parseInt(field(block, 'layer') || '0', 10),
+            datatype: parseInt(field(block, 'datatype') || '0', 10),
+            color: colorText.startsWith('#') ? colorText : `#${colorText}`,
+        });
+    }
+
+    const findLayer = (key, fallbackIndex) => {
+        const match = layers.find((l) => l.name.includes(key));
+        return match || layers[fallbackIndex] || null;
+    };
+
+    return {
+        wafer: findLayer('wafer', 0),
+        usable: findLayer('usable', 1) || findLayer('edge', 1),
+        die: findLayer('die', 2) || findLayer('chip', 2),
+    };
+}
+'''
 
 HTML_TEMPLATE = '''<!DOCTYPE html>
 <html data-theme="dark">
@@ -663,6 +1083,10 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             display: flex;
             flex-direction: column;
             gap: 12px;
+            /* Skip rendering sections scrolled out of the panel; "auto" keeps the
+               last rendered height as the placeholder so scrolling does not jump */
+            content-visibility: auto;
+            contain-intrinsic-size: auto 300px;
         }
 
         .sidebar-section.collapsed .sidebar-content {
@@ -782,6 +1206,13 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             display: block;
         }
 
+        /* Background (grid, outline) and foreground (dies) layers stacked in place */
+        .canvas-wrapper canvas {
+            position: absolute;
+            top: 0;
+            left: 0;
+        }
+
         /* Right Panel */
         .right-panel {
             width: 320px;
@@ -942,32 +1373,6 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             flex: 1;
         }
 
-        /* Toast Notifications */
-        .toast-container {
-            position: fixed;
-            bottom: 48px;
-            right: 344px;
-            z-index: 1000;
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-        }
-
-        .toast {
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-left: 3px solid var(--accent-blue);
-            border-radius: var(--radius);
-            padding: 12px 16px;
-            box-shadow: var(--shadow-lg);
-            min-width: 280px;
-            animation: slideIn 0.3s ease;
-        }
-
-        .toast.success { border-left-color: var(--accent-green); }
-        .toast.error { border-left-color: var(--accent-red); }
-        .toast.warning { border-left-color: var(--accent-orange); }
-
         .modal-backdrop {
             position: fixed;
             top: 0;
@@ -985,92 +1390,6 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             display: flex;
         }
 
-        .modal {
-            width: 520px;
-            max-width: 92vw;
-            background: var(--bg-secondary);
-            border: 1px solid var(--border-color);
-            border-radius: var(--radius);
-            box-shadow: var(--shadow-lg);
-            padding: 18px;
-        }
-
-        .modal-header {
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-            margin-bottom: 12px;
-        }
-
-        .modal-title {
-            font-size: 15px;
-            font-weight: 600;
-            color: var(--text-primary);
-        }
-
-        .modal-body {
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-        }
-
-        .modal textarea {
-            min-height: 120px;
-            resize: vertical;
-            background: var(--bg-primary);
-            border: 1px solid var(--border-color);
-            color: var(--text-primary);
-            padding: 10px 12px;
-            border-radius: var(--radius-sm);
-            font-size: 13px;
-            font-family: var(--font-sans);
-        }
-
-        .modal-actions {
-            display: flex;
-            justify-content: flex-end;
-            gap: 8px;
-            margin-top: 12px;
-        }
-
-        @keyframes slideIn {
-            from {
-                transform: translateX(100%);
-                opacity: 0;
-            }
-            to {
-                transform: translateX(0);
-                opacity: 1;
-            }
-        }
-
-        @keyframes slideOut {
-            from {
-                transform: translateX(0);
-                opacity: 1;
-            }
-            to {
-                transform: translateX(100%);
-                opacity: 0;
-            }
-        }
-
-        .toast.hiding {
-            animation: slideOut 0.3s ease forwards;
-        }
-
-        .toast-title {
-            font-weight: 600;
-            font-size: 13px;
-            color: var(--text-primary);
-            margin-bottom: 4px;
-        }
-
-        .toast-message {
-            font-size: 12px;
-            color: var(--text-secondary);
-        }
-
         /* Error message */
         .error-message {
             background: rgba(239, 68, 68, 0.1);
@@ -1086,12 +1405,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         .error-message.show {
             display: block;
             animation: shake 0.5s ease;
-        }
-
-        @keyframes shake {
-            0%, 100% { transform: translateX(0); }
-            25% { transform: translateX(-5px); }
-            75% { transform: translateX(5px); }
+            will-change: transform;
         }
 
         /* Export buttons */
@@ -1109,45 +1423,6 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             margin: 8px 0;
         }
 
-        /* Tooltip */
-        .tooltip {
-            position: absolute;
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-color);
-            border-radius: var(--radius-sm);
-            padding: 8px 12px;
-            font-size: 12px;
-            color: var(--text-primary);
-            pointer-events: none;
-            z-index: 1000;
-            box-shadow: var(--shadow);
-            display: none;
-        }
-
-        .tooltip.show {
-            display: block;
-        }
-
-        /* Coordinate overlay */
-        .coord-overlay {
-            position: absolute;
-            top: 16px;
-            left: 16px;
-            background: rgba(26, 26, 46, 0.9);
-            border: 1px solid var(--border-color);
-            border-radius: var(--radius-sm);
-            padding: 8px 12px;
-            font-family: var(--font-mono);
-            font-size: 12px;
-            color: var(--text-secondary);
-            pointer-events: none;
-            backdrop-filter: blur(4px);
-        }
-
-        .coord-overlay [data-theme="light"] & {
-            background: rgba(255, 255, 255, 0.9);
-        }
-
         /* Empty state */
         .empty-state {
             display: flex;
@@ -1169,33 +1444,17 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         .empty-state h3 {
             font-size: 16px;
             font-weight: 600;
-            color: var(--text-secondary);
-            margin-bottom: 8px;
-        }
-
-        .empty-state p {
-            font-size: 13px;
-        }
-
-        /* Scrollbar styling */
-        ::-webkit-scrollbar {
-            width: 8px;
-            height: 8px;
-        }
-
-        ::-webkit-scrollbar-track {
-            background: var(--bg-primary);
-        }
-
-        ::-webkit-scrollbar-thumb {
-            background: var(--border-color);
-            border-radius: 4px;
+            color: var(--text-secondary);
+            margin-bottom: 8px;
         }
 
-        ::-webkit-scrollbar-thumb:hover {
-            background: var(--text-muted);
+        .empty-state p {
+            font-size: 13px;
         }
     </style>
+    <link rel="preload" href="/static/deferred.css?v=__DEFERRED_CSS_VERSION__" as="style"
+          onload="this.onload=null;this.rel='stylesheet'">
+    <noscript><link rel="stylesheet" href="/static/deferred.css?v=__DEFERRED_CSS_VERSION__"></noscript>
 </head>
 <body>
     <!-- Toast Container -->
@@ -1225,7 +1484,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         <!-- Left Sidebar -->
         <aside class="sidebar">
             <div class="sidebar-section" id="sectionWafer">
-                <div class="sidebar-header" onclick="toggleSection('sectionWafer')">
+                <div class="sidebar-header" data-section="sectionWafer">
                     <span>Wafer Parameters</span>
                     <span class="chevron">▼</span>
                 </div>
@@ -1267,7 +1526,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             </div>
 
             <div class="sidebar-section" id="sectionDie">
-                <div class="sidebar-header" onclick="toggleSection('sectionDie')">
+                <div class="sidebar-header" data-section="sectionDie">
                     <span>Die Parameters</span>
                     <span class="chevron">▼</span>
                 </div>
@@ -1306,7 +1565,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             </div>
 
             <div class="sidebar-section" id="sectionLayers">
-                <div class="sidebar-header" onclick="toggleSection('sectionLayers')">
+                <div class="sidebar-header" data-section="sectionLayers">
                     <span>Layer Visibility</span>
                     <span class="chevron">▼</span>
                 </div>
@@ -1371,6 +1630,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             </div>
 
             <div class="canvas-wrapper" id="canvasWrapper">
+                <canvas id="waferBgCanvas"></canvas>
                 <canvas id="waferCanvas"></canvas>
                 <div class="coord-overlay" id="coordOverlay" style="display: none;">
                     X: <span id="mouseX" class="value">0.00</span> mm | 
@@ -1387,7 +1647,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         <!-- Right Panel -->
         <aside class="right-panel">
             <div class="sidebar-section" id="sectionResults">
-                <div class="sidebar-header" onclick="toggleSection('sectionResults')">
+                <div class="sidebar-header" data-section="sectionResults">
                     <span>Results</span>
                     <span class="chevron">▼</span>
                 </div>
@@ -1425,8 +1685,8 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 </div>
             </div>
 
-            <div class="sidebar-section" id="sectionInfo">
-                <div class="sidebar-header" onclick="toggleSection('sectionInfo')">
+            <div class="sidebar-section collapsed" id="sectionInfo">
+                <div class="sidebar-header" data-section="sectionInfo">
                     <span>Algorithm Info</span>
                     <span class="chevron">▼</span>
                 </div>
@@ -1469,7 +1729,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         <div class="modal" role="dialog" aria-modal="true" aria-labelledby="feedbackTitle">
             <div class="modal-header">
                 <div class="modal-title" id="feedbackTitle">Submit Feedback</div>
-                <button class="toolbar-btn" id="feedbackClose" title="Close">✕</button>
+                <button class="toolbar-btn" id="feedbackClose" title="Close" data-close="feedbackModal">✕</button>
             </div>
             <div class="modal-body">
                 <div class="input-group">
@@ -1484,16 +1744,12 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                     <label for="feedbackMessage">Message</label>
                     <textarea id="feedbackMessage" placeholder="Describe the issue or improvement..."></textarea>
                 </div>
-                <div class="input-group" style="display: none;">
-                    <label for="feedbackWebsite">Website</label>
-                    <input type="text" id="feedbackWebsite" autocomplete="off">
-                </div>
                 <div class="input-group">
                     <label for="feedbackEmail">Email (optional)</label>
                     <input type="email" id="feedbackEmail" placeholder="you@example.com">
                 </div>
                 <div class="modal-actions">
-                    <button class="toolbar-btn" id="feedbackCancel">Cancel</button>
+                    <button class="toolbar-btn" id="feedbackCancel" data-close="feedbackModal">Cancel</button>
                     <button class="toolbar-btn primary" id="feedbackSubmit">Send Feedback</button>
                 </div>
             </div>
@@ -1505,7 +1761,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         <div class="modal" role="dialog" aria-modal="true" aria-labelledby="layerTitle">
             <div class="modal-header">
                 <div class="modal-title" id="layerTitle">Edit GDS Layer</div>
-                <button class="toolbar-btn" id="layerClose" title="Close">✕</button>
+                <button class="toolbar-btn" id="layerClose" title="Close" data-close="layerModal">✕</button>
             </div>
             <div class="modal-body">
                 <div class="input-group">
@@ -1517,7 +1773,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                     <input type="number" id="datatypeNumberInput" min="0" step="1">
                 </div>
                 <div class="modal-actions">
-                    <button class="toolbar-btn" id="layerCancel">Cancel</button>
+                    <button class="toolbar-btn" id="layerCancel" data-close="layerModal">Cancel</button>
                     <button class="toolbar-btn primary" id="layerSave">Save</button>
                 </div>
             </div>
@@ -1526,15 +1782,15 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 
     <script>
         // SEMI standard specifications
-        const semiStandards = {
-            '300mm': {diameter: 300, flat_length: 0, notch_depth: 1.0, edge_exclusion: 3},
-            '200mm': {diameter: 200, flat_length: 0, notch_depth: 1.0, edge_exclusion: 3},
-            '150mm': {diameter: 150, flat_length: 47.5, notch_depth: 0, edge_exclusion: 3},
-            '125mm': {diameter: 125, flat_length: 42.5, notch_depth: 0, edge_exclusion: 3},
-            '100mm': {diameter: 100, flat_length: 32.5, notch_depth: 0, edge_exclusion: 3},
-            '76mm': {diameter: 76.2, flat_length: 22.2, notch_depth: 0, edge_exclusion: 2.5},
-            '50mm': {diameter: 50.8, flat_length: 15.9, notch_depth: 0, edge_exclusion: 2.5}
-        };
+        const semiStandards = Object.freeze({
+            '300mm': Object.freeze({diameter: 300, flat_length: 0, notch_depth: 1.0, edge_exclusion: 3}),
+            '200mm': Object.freeze({diameter: 200, flat_length: 0, notch_depth: 1.0, edge_exclusion: 3}),
+            '150mm': Object.freeze({diameter: 150, flat_length: 47.5, notch_depth: 0, edge_exclusion: 3}),
+            '125mm': Object.freeze({diameter: 125, flat_length: 42.5, notch_depth: 0, edge_exclusion: 3}),
+            '100mm': Object.freeze({diameter: 100, flat_length: 32.5, notch_depth: 0, edge_exclusion: 3}),
+            '76mm': Object.freeze({diameter: 76.2, flat_length: 22.2, notch_depth: 0, edge_exclusion: 2.5}),
+            '50mm': Object.freeze({diameter: 50.8, flat_length: 15.9, notch_depth: 0, edge_exclusion: 2.5})
+        });
 
         // Canvas state variables
         let zoomScale = 1.0;
@@ -1545,9 +1801,34 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         let lastMouseY = 0;
         let currentData = null;
         let baseScale = 1.0;
+        let drawPending = false;
+
+        // Background inputs from the last static draw. The background canvas is
+        // only repainted when one of them changes; die-only updates such as the
+        // die layer toggles leave it untouched.
+        let staticKey = null;
+
+        // Grid lines, rebuilt only when gridKey (size and spacing) changes
+        let gridPath, gridKey = '';
+
+        // Wafer outline paths in mm, rebuilt only when pathKey (the geometry) changes.
+        // pathSource is the result object they were last checked against.
+        // waferEdgePath is the wafer circle plus the notch V, stroked together.
+        let waferPath, waferEdgePath, usablePath, flatChordPath, flatPath, notchPath, pathKey = '';
+        let pathSource = null;
+
+        // Coalesce redraw requests into at most one drawWafer per animation frame
+        function scheduleDraw() {
+            if (drawPending || !currentData) return;
+            drawPending = true;
+            requestAnimationFrame(() => {
+                drawPending = false;
+                drawWafer(currentData);
+            });
+        }
 
-        // Layer visibility
-        let layerVisibility = {
+        // Layer visibility; mutated in place so its shape never changes
+        const layerVisibility = {
             wafer: true,
             usable: true,
             dieFull: true,
@@ -1562,17 +1843,111 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             diePartial: { color: '#eab308' },
         };
 
+        // Element handles looked up once; the script runs after the markup is parsed
+        const els = Object.freeze({
+            feedbackType: document.getElementById('feedbackType'),
+            feedbackMessage: document.getElementById('feedbackMessage'),
+            feedbackEmail: document.getElementById('feedbackEmail'),
+            wafer: document.getElementById('wafer'),
+            die_width: document.getElementById('die_width'),
+            die_height: document.getElementById('die_height'),
+            scribe: document.getElementById('scribe'),
+            edge: document.getElementById('edge'),
+            flat_length: document.getElementById('flat_length'),
+            notch_depth: document.getElementById('notch_depth'),
+            layerNumberInput: document.getElementById('layerNumberInput'),
+            datatypeNumberInput: document.getElementById('datatypeNumberInput'),
+            mouseX: document.getElementById('mouseX'),
+            mouseY: document.getElementById('mouseY'),
+            mouseCoords: document.getElementById('mouseCoords'),
+            statusMouseCoords: document.getElementById('statusMouseCoords'),
+            coordOverlay: document.getElementById('coordOverlay'),
+            emptyState: document.getElementById('emptyState'),
+            zoomLevel: document.getElementById('zoomLevel'),
+            canvasWrapper: document.getElementById('canvasWrapper'),
+            includePartial: document.getElementById('includePartial'),
+            alignX: document.getElementById('alignX'),
+            alignY: document.getElementById('alignY'),
+        });
+        const layerMetas = [...document.querySelectorAll('.layer-meta')];
+
+        // Input assignments for each SEMI preset, resolved once against the cached inputs
+        const semiMap = new Map(Object.entries(semiStandards).map(([key, std]) => [key, [
+            [els.wafer, String(std.diameter)],
+            [els.flat_length, String(std.flat_length)],
+            [els.notch_depth, String(std.notch_depth)],
+            [els.edge, String(std.edge_exclusion)],
+        ]]));
+
         // Theme toggle
         const themeToggle = document.getElementById('themeToggle');
         const themeIcon = document.getElementById('themeIcon');
+
+        // Canvas colours for each theme
+        const THEME_COLORS = Object.freeze({
+            dark: Object.freeze({
+                grid: 'rgba(168, 85, 247, 0.15)',
+                axis: 'rgba(168, 85, 247, 0.4)',
+                axisLabel: 'rgba(168, 85, 247, 0.8)',
+                waferFill: 'rgba(100, 100, 100, 0.2)',
+                waferStroke: '#666',
+                flatFill: 'rgba(239, 68, 68, 0.2)',
+                dieStroke: 'rgba(255, 255, 255, 0.55)',
+                crosshair: 'rgba(168, 85, 247, 0.8)',
+            }),
+            light: Object.freeze({
+                grid: 'rgba(168, 85, 247, 0.1)',
+                axis: 'rgba(168, 85, 247, 0.3)',
+                axisLabel: 'rgba(168, 85, 247, 0.7)',
+                waferFill: 'rgba(200, 200, 200, 0.3)',
+                waferStroke: '#999',
+                flatFill: 'rgba(239, 68, 68, 0.15)',
+                dieStroke: 'rgba(0, 0, 0, 0.5)',
+                crosshair: 'rgba(168, 85, 247, 0.6)',
+            }),
+        });
+
+        // The draw code reads these instead of querying data-theme every frame;
+        // readTheme() refreshes them whenever the attribute changes
+        let isDarkTheme = false;
+        let themeColors = THEME_COLORS.light;
+
+        function readTheme() {
+            isDarkTheme = document.documentElement.getAttribute('data-theme') === 'dark';
+            themeColors = isDarkTheme ? THEME_COLORS.dark : THEME_COLORS.light;
+        }
+        readTheme();
         
+        // Theme redraws are skipped while the canvas cannot be seen and replayed
+        // once it is visible again
+        let canvasVisible = true;
+        let themeRedrawPending = false;
+
+        function flushThemeRedraw() {
+            if (!themeRedrawPending || !canvasVisible || document.visibilityState !== 'visible') return;
+            themeRedrawPending = false;
+            scheduleDraw();
+        }
+
+        new IntersectionObserver(([entry]) => {
+            canvasVisible = entry.isIntersecting;
+            flushThemeRedraw();
+        }).observe(els.canvasWrapper);
+        document.addEventListener('visibilitychange', flushThemeRedraw);
+
+        new MutationObserver(() => {
+            readTheme();
+            if (currentData) {
+                themeRedrawPending = true;
+                flushThemeRedraw();
+            }
+        }).observe(document.documentElement, { attributes: true, attributeFilter: ['data-theme'] });
+
         themeToggle.addEventListener('click', () => {
             const html = document.documentElement;
-            const currentTheme = html.getAttribute('data-theme');
-            const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+            const newTheme = isDarkTheme ? 'light' : 'dark';
             html.setAttribute('data-theme', newTheme);
             themeIcon.textContent = newTheme === 'dark' ? '🌙' : '☀️';
-            if (currentData) drawWafer(currentData);
         });
 
         // Feedback modal
@@ -1580,125 +1955,123 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         document.getElementById('feedbackBtn').addEventListener('click', () => {
             feedbackModal.classList.add('show');
         });
-        document.getElementById('feedbackClose').addEventListener('click', () => {
-            feedbackModal.classList.remove('show');
-        });
-        document.getElementById('feedbackCancel').addEventListener('click', () => {
-            feedbackModal.classList.remove('show');
-        });
-        feedbackModal.addEventListener('click', (e) => {
-            if (e.target === feedbackModal) {
-                feedbackModal.classList.remove('show');
+
+        // Close buttons name their modal with data-close; a click on a backdrop
+        // itself (outside the dialog) closes that modal
+        document.body.addEventListener('click', (e) => {
+            const closeBtn = e.target.closest('[data-close]');
+            if (closeBtn) {
+                document.getElementById(closeBtn.dataset.close).classList.remove('show');
+            } else if (e.target.classList.contains('modal-backdrop')) {
+                e.target.classList.remove('show');
             }
         });
-        document.getElementById('feedbackSubmit').addEventListener('click', async () => {
-            const feedbackType = document.getElementById('feedbackType').value;
-            const feedbackMessage = document.getElementById('feedbackMessage').value.trim();
-            const feedbackEmail = document.getElementById('feedbackEmail').value.trim();
-            const feedbackWebsite = document.getElementById('feedbackWebsite').value.trim();
+
+        document.getElementById('feedbackSubmit').addEventListener('click', () => {
+            const feedbackType = els.feedbackType.value;
+            const feedbackMessage = els.feedbackMessage.value.trim();
+            const feedbackEmail = els.feedbackEmail.value.trim();
 
             if (!feedbackMessage) {
                 showToast('Feedback Required', 'Please enter a message.', 'warning');
                 return;
             }
 
-            try {
-                const payload = {
-                    type: feedbackType,
-                    message: feedbackMessage,
-                    email: feedbackEmail,
-                    website: feedbackWebsite,
-                    timestamp: new Date().toISOString(),
-                    context: {
-                        wafer: document.getElementById('wafer').value,
-                        die_width: document.getElementById('die_width').value,
-                        die_height: document.getElementById('die_height').value,
-                        scribe: document.getElementById('scribe').value,
-                        edge: document.getElementById('edge').value,
-                        flat_length: document.getElementById('flat_length').value,
-                        notch_depth: document.getElementById('notch_depth').value,
-                    }
-                };
-
-                const response = await fetch('/feedback', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(payload),
-                });
-
-                const data = await response.json();
-                if (data.error) {
-                    throw new Error(data.error);
+            const body = JSON.stringify({
+                type: feedbackType,
+                message: feedbackMessage,
+                email: feedbackEmail,
+                timestamp: new Date().toISOString(),
+                context: {
+                    wafer: els.wafer.value,
+                    die_width: els.die_width.value,
+                    die_height: els.die_height.value,
+                    scribe: els.scribe.value,
+                    edge: els.edge.value,
+                    flat_length: els.flat_length.value,
+                    notch_depth: els.notch_depth.value,
                 }
+            });
 
-                document.getElementById('feedbackMessage').value = '';
-                document.getElementById('feedbackEmail').value = '';
-                feedbackModal.classList.remove('show');
-                showToast('Thanks!', 'Your feedback was sent.', 'success');
-            } catch (err) {
-                showToast('Feedback Failed', err.message, 'error');
-            }
+            // keepalive lets the request outlive the page, and the modal closes
+            // straight away. The toast reports the server's answer, so a rejected
+            // submission (validation, rate limit) is not reported as sent, and the
+            // typed message is only cleared once it has been accepted.
+            feedbackModal.classList.remove('show');
+            fetch('/feedback', {
+                method: 'POST',
+                keepalive: true,
+                headers: { 'Content-Type': 'application/json' },
+                body,
+            })
+                .then(async (response) => {
+                    if (!response.ok) {
+                        const data = await response.json().catch(() => ({}));
+                        throw new Error(data.error || response.statusText);
+                    }
+                    els.feedbackMessage.value = '';
+                    els.feedbackEmail.value = '';
+                    showToast('Thanks!', 'Your feedback was sent.', 'success');
+                })
+                .catch((err) => showToast('Feedback Failed', err.message, 'error'));
         });
 
         // Layer config modal
         const layerModal = document.getElementById('layerModal');
         let activeLayerKey = 'wafer';
 
-        function updateLayerMeta() {
-            document.querySelectorAll('.layer-meta').forEach((meta) => {
-                const key = meta.dataset.layerKey;
-                const config = layerConfig[key];
-                meta.textContent = `${config.layer}/${config.datatype}`;
-            });
-
-            document.querySelectorAll('.layer-color.wafer').forEach((el) => {
-                el.style.background = layerConfig.wafer.color;
-            });
-            document.querySelectorAll('.layer-color.usable').forEach((el) => {
-                el.style.background = layerConfig.usable.color;
-            });
-            document.querySelectorAll('.layer-color.die-full').forEach((el) => {
-                el.style.background = layerConfig.die.color;
+        // Color swatches per layerConfig key, collected once
+        const colorSwatchEls = {
+            wafer: [...document.querySelectorAll('.layer-color.wafer')],
+            usable: [...document.querySelectorAll('.layer-color.usable')],
+            die: [...document.querySelectorAll('.layer-color.die-full')],
+        };
+        let pendingLayerUpdate = false;
+
+        // Coalesce layer label and swatch writes into a single frame
+        function scheduleLayerMeta() {
+            if (pendingLayerUpdate) return;
+            pendingLayerUpdate = true;
+            requestAnimationFrame(() => {
+                pendingLayerUpdate = false;
+                for (const meta of layerMetas) {
+                    const config = layerConfig[meta.dataset.layerKey];
+                    meta.textContent = `${config.layer}/${config.datatype}`;
+                }
+                for (const key in colorSwatchEls) {
+                    const color = layerConfig[key].color;
+                    for (const el of colorSwatchEls[key]) el.style.background = color;
+                }
             });
         }
 
         function openLayerModal(layerKey) {
             activeLayerKey = layerKey;
-            document.getElementById('layerNumberInput').value = layerConfig[layerKey].layer;
-            document.getElementById('datatypeNumberInput').value = layerConfig[layerKey].datatype;
+            els.layerNumberInput.value = layerConfig[layerKey].layer;
+            els.datatypeNumberInput.value = layerConfig[layerKey].datatype;
             layerModal.classList.add('show');
         }
 
-        document.querySelectorAll('.layer-meta').forEach((meta) => {
-            meta.addEventListener('click', (e) => {
-                e.preventDefault();
-                e.stopPropagation();
-                openLayerModal(meta.dataset.layerKey);
-            });
-            meta.addEventListener('contextmenu', (e) => {
-                e.preventDefault();
-                openLayerModal(meta.dataset.layerKey);
-            });
-        });
+        // One delegated pair of listeners covers every layer-meta cell, including
+        // rows added after load
+        function handleLayerMeta(e) {
+            const meta = e.target.closest('.layer-meta');
+            if (!meta) return;
+            e.preventDefault();
+            if (e.type === 'click') e.stopPropagation();
+            openLayerModal(meta.dataset.layerKey);
+        }
 
-        document.getElementById('layerClose').addEventListener('click', () => {
-            layerModal.classList.remove('show');
-        });
-        document.getElementById('layerCancel').addEventListener('click', () => {
-            layerModal.classList.remove('show');
-        });
-        layerModal.addEventListener('click', (e) => {
-            if (e.target === layerModal) {
-                layerModal.classList.remove('show');
-            }
-        });
+        const sidebar = document.querySelector('.sidebar');
+        sidebar.addEventListener('click', handleLayerMeta);
+        sidebar.addEventListener('contextmenu', handleLayerMeta);
 
         document.getElementById('layerSave').addEventListener('click', () => {
-            const layerValue = parseInt(document.getElementById('layerNumberInput').value || '0', 10);
-            const datatypeValue = parseInt(document.getElementById('datatypeNumberInput').value || '0', 10);
+            const layerValue = parseInt(els.layerNumberInput.value || '0', 10);
+            const datatypeValue = parseInt(els.datatypeNumberInput.value || '0', 10);
             layerConfig[activeLayerKey].layer = Math.max(0, layerValue);
             layerConfig[activeLayerKey].datatype = Math.max(0, datatypeValue);
-            updateLayerMeta();
+            scheduleLayerMeta();
             layerModal.classList.remove('show');
             showToast('Layer Updated', `Set ${activeLayerKey} to ${layerConfig[activeLayerKey].layer}/${layerConfig[activeLayerKey].datatype}`, 'success');
         });
@@ -1707,7 +2080,18 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         const importLypBtn = document.getElementById('importLypBtn');
         const importLypInput = document.getElementById('importLypInput');
 
+        // The .lyp parser module is fetched on first use only
+        let lypParser = null;
+        function loadLypParser() {
+            lypParser ??= import('/static/lyp-parser.js?v=__LYP_PARSER_VERSION__').catch((err) => {
+                lypParser = null;
+                throw err;
+            });
+            return lypParser;
+        }
+
         importLypBtn.addEventListener('click', () => {
+            loadLypParser().catch(() => {});  // Warm the module while the file picker is open
             importLypInput.click();
         });
 
@@ -1716,31 +2100,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             if (!file) return;
 
             const reader = new FileReader();
-            reader.onload = () => {
+            reader.onload = async () => {
                 try {
-                    const xml = reader.result;
-                    const parser = new DOMParser();
-                    const doc = parser.parseFromString(xml, 'text/xml');
-                    const props = Array.from(doc.getElementsByTagName('properties'));
-
-                    const layers = props.map((node) => {
-                        const name = node.getElementsByTagName('name')[0]?.textContent?.toLowerCase() || '';
-                        const layer = parseInt(node.getElementsByTagName('layer')[0]?.textContent || '0', 10);
-                        const datatype = parseInt(node.getElementsByTagName('datatype')[0]?.textContent || '0', 10);
-                        const colorText = node.getElementsByTagName('color')[0]?.textContent || '';
-                        const color = colorText.startsWith('#') ? colorText : `#${colorText}`;
-
-                        return { name, layer, datatype, color };
-                    });
-
-                    const findLayer = (key, fallbackIndex) => {
-                        const match = layers.find((l) => l.name.includes(key));
-                        return match || layers[fallbackIndex] || null;
-                    };
-
-                    const waferLayer = findLayer('wafer', 0);
-                    const usableLayer = findLayer('usable', 1) || findLayer('edge', 1);
-                    const dieLayer = findLayer('die', 2) || findLayer('chip', 2);
+                    const { parseLyp } = await loadLypParser();
+                    const {
+                        wafer: waferLayer,
+                        usable: usableLayer,
+                        die: dieLayer,
+                    } = parseLyp(reader.result);
 
                     if (waferLayer) {
                         layerConfig.wafer.layer = waferLayer.layer;
@@ -1758,7 +2125,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                         if (dieLayer.color) layerConfig.die.color = dieLayer.color;
                     }
 
-                    updateLayerMeta();
+                    scheduleLayerMeta();
                     showToast('Layer Import', 'Loaded layer numbers and colors from .lyp', 'success');
                 } catch (err) {
                     showToast('Layer Import Failed', err.message, 'error');
@@ -1770,16 +2137,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         });
 
         function applyStandardSize(value, showToastMessage = false) {
-            const std = semiStandards[value];
-            if (std) {
-                document.getElementById('wafer').value = std.diameter;
-                document.getElementById('flat_length').value = std.flat_length;
-                document.getElementById('notch_depth').value = std.notch_depth;
-                document.getElementById('edge').value = std.edge_exclusion;
+            const entries = semiMap.get(value);
+            if (entries) {
+                for (const [el, val] of entries) el.value = val;
                 if (showToastMessage) {
                     showToast('SEMI Standard Applied', `${value} parameters loaded`, 'success');
                 }
             }
+            readOutlineInputs();
             drawWaferOutline();
         }
 
@@ -1788,10 +2153,39 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             applyStandardSize(this.value, true);
         });
 
-        // Auto-draw wafer outline when wafer parameters change
-        const waferParams = ['wafer', 'edge', 'flat_length', 'notch_depth'];
-        waferParams.forEach(id => {
-            document.getElementById(id).addEventListener('input', debounce(drawWaferOutline, 100));
+        // Auto-draw wafer outline when wafer parameters change. One delegated
+        // listener debounces typing and spinner holds, then redraws on the next frame.
+        // Each input is parsed once, when it changes, into outlineInputs; the
+        // debounced redraw is skipped if no parsed value actually changed.
+        const OUTLINE_DEFAULTS = Object.freeze({ wafer: 100, edge: 3, flat_length: 0, notch_depth: 0 });
+        const outlineInputs = { ...OUTLINE_DEFAULTS };
+        let outlineDirty = false;
+        let outlineFrame = 0;
+
+        function parseOutlineInput(id) {
+            return parseFloat(els[id].value) || OUTLINE_DEFAULTS[id];
+        }
+
+        // Re-reads every outline input, for value changes that fire no input event
+        function readOutlineInputs() {
+            for (const id of Object.keys(OUTLINE_DEFAULTS)) outlineInputs[id] = parseOutlineInput(id);
+        }
+
+        const scheduleOutline = debounce(() => {
+            if (outlineFrame) return;
+            outlineFrame = requestAnimationFrame(() => {
+                outlineFrame = 0;
+                if (outlineDirty) drawWaferOutline();
+            });
+        }, 100);
+        sidebar.addEventListener('input', (e) => {
+            const id = e.target.id;
+            if (!(id in OUTLINE_DEFAULTS)) return;
+            const value = parseOutlineInput(id);
+            if (value === outlineInputs[id]) return;
+            outlineInputs[id] = value;
+            outlineDirty = true;
+            scheduleOutline();
         });
 
         function debounce(func, wait) {
@@ -1806,148 +2200,144 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             };
         }
 
-        function drawWaferOutline() {
-            const canvas = document.getElementById('waferCanvas');
-            const ctx = canvas.getContext('2d');
-            const isDark = document.documentElement.getAttribute('data-theme') === 'dark';
-            const emptyState = document.getElementById('emptyState');
-
-            // Get wafer parameters
-            const waferDiameter = parseFloat(document.getElementById('wafer').value) || 100;
-            const edgeExclusion = parseFloat(document.getElementById('edge').value) || 3;
-            const flatLength = parseFloat(document.getElementById('flat_length').value) || 0;
-            const notchDepth = parseFloat(document.getElementById('notch_depth').value) || 0;
-
-            const waferRadius = waferDiameter / 2;
-            const usableRadius = waferRadius - edgeExclusion;
-
-            // Calculate sagitta
+        // Wafer outline geometry from the form inputs, in the same shape as the
+        // /calculate result fields used by buildOutlinePaths
+        function computeGeometry(waferDiameter, edgeExclusion, flatLength, notchDepth) {
+            const r = waferDiameter / 2;
             let sagitta = 0;
-            if (flatLength > 0 && flatLength <= 2 * waferRadius) {
+            if (flatLength > 0 && flatLength <= 2 * r) {
                 const halfFlat = flatLength / 2;
-                sagitta = waferRadius - Math.sqrt(waferRadius**2 - halfFlat**2);
+                sagitta = r - Math.sqrt(r * r - halfFlat * halfFlat);
             } else if (notchDepth > 0) {
                 sagitta = notchDepth;
             }
+            return {
+                wafer_radius: r,
+                usable_radius: r - edgeExclusion,
+                sagitta,
+                flat_length: flatLength,
+                notch_depth: notchDepth,
+            };
+        }
+
+        function drawWaferOutline() {
+            // The outline preview has no dies, so it is drawn entirely on the
+            // background layer and the foreground is left empty
+            const ctx = bgCtx;
+            canvasCtx.clearRect(0, 0, canvas.width, canvas.height);
+            staticKey = null;
+            const colors = themeColors;
+
+            // Wafer parameters, parsed as they were typed
+            outlineDirty = false;
+            const { wafer, edge, flat_length: flatLength, notch_depth: notchDepth } = outlineInputs;
+            const geometry = computeGeometry(wafer, edge, flatLength, notchDepth);
 
             // Hide empty state and show coordinate overlay
-            emptyState.style.display = 'none';
-            document.getElementById('coordOverlay').style.display = 'block';
+            els.emptyState.style.display = 'none';
+            els.coordOverlay.style.display = 'block';
 
             // Clear canvas
             ctx.clearRect(0, 0, canvas.width, canvas.height);
 
             const centerX = canvas.width / 2;
             const centerY = canvas.height / 2;
-            baseScale = 200 / waferRadius;
+            baseScale = 200 / geometry.wafer_radius;
             const scale = baseScale * zoomScale;
             // Draw grid background
             drawGrid(ctx, canvas.width, canvas.height, centerX, centerY, scale);
 
-            // Draw wafer outline
-            ctx.beginPath();
-            ctx.arc(centerX + offsetX, centerY + offsetY, waferRadius * scale, 0, 2 * Math.PI);
-            ctx.fillStyle = isDark ? 'rgba(100, 100, 100, 0.2)' : 'rgba(200, 200, 200, 0.3)';
-            ctx.fill();
-            ctx.strokeStyle = isDark ? '#666' : '#999';
-            ctx.lineWidth = 2;
-            ctx.stroke();
+            // Outline geometry in mm, drawn through the view transform about the
+            // wafer centre snapped to a whole pixel
+            buildOutlinePaths(geometry);
+            const px = 1 / scale;
+            const showFlatNotch = flatNotchVisible(px);
+            const originX = Math.round(centerX + offsetX);
+            const originY = Math.round(centerY + offsetY);
+            ctx.setTransform(scale, 0, 0, scale, originX, originY);
+
+            // Draw wafer outline; a notch shares its style and is stroked with it
+            ctx.fillStyle = colors.waferFill;
+            ctx.strokeStyle = colors.waferStroke;
+            ctx.lineWidth = 2 * px;
+            ctx.fill(waferPath);
+            ctx.stroke(showFlatNotch && notchPath ? waferEdgePath : waferPath);
 
             // Draw usable area
-            ctx.beginPath();
-            ctx.arc(centerX + offsetX, centerY + offsetY, usableRadius * scale, 0, 2 * Math.PI);
             ctx.strokeStyle = layerConfig.usable.color;
-            ctx.setLineDash([5, 5]);
-            ctx.lineWidth = 2;
-            ctx.stroke();
+            ctx.setLineDash([5 * px, 5 * px]);
+            ctx.stroke(usablePath);
             ctx.setLineDash([]);
 
-            // Draw flat/notch
-            if (sagitta > 0) {
-                if (flatLength > 0) {
-                    const halfFlat = flatLength / 2;
-                    const flatY_canvas = waferRadius - sagitta;
-                    const intersectX = Math.sqrt(2 * waferRadius * sagitta - sagitta * sagitta);
-
-                    // Draw the flat chord
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.strokeStyle = isDark ? '#666' : '#999';
-                    ctx.lineWidth = 3;
-                    ctx.stroke();
-
-                    const angleToLeft = Math.atan2(flatY_canvas, -intersectX);
-                    const angleToRight = Math.atan2(flatY_canvas, intersectX);
-
-                    ctx.beginPath();
-                    ctx.arc(centerX + offsetX, centerY + offsetY, waferRadius * scale, angleToLeft, angleToRight);
-                    ctx.strokeStyle = isDark ? '#666' : '#999';
-                    ctx.lineWidth = 2;
-                    ctx.setLineDash([3, 3]);
-                    ctx.stroke();
-                    ctx.setLineDash([]);
-
-                    ctx.save();
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.arc(centerX + offsetX, centerY + offsetY, waferRadius * scale, angleToRight, angleToLeft, true);
-                    ctx.closePath();
-                    ctx.fillStyle = isDark ? 'rgba(100, 100, 100, 0.2)' : 'rgba(200, 200, 200, 0.3)';
-                    ctx.fill();
-                    ctx.restore();
-                } else if (notchDepth > 0) {
-                    const flatY = waferRadius - sagitta;
-                    const notchWidth = 2;
-
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - notchWidth * scale, centerY + offsetY + (flatY + sagitta) * scale);
-                    ctx.lineTo(centerX + offsetX, centerY + offsetY + flatY * scale);
-                    ctx.lineTo(centerX + offsetX + notchWidth * scale, centerY + offsetY + (flatY + sagitta) * scale);
-                    ctx.strokeStyle = isDark ? '#666' : '#999';
-                    ctx.lineWidth = 2;
-                    ctx.stroke();
-                }
+            // Draw flat
+            if (showFlatNotch && flatChordPath) {
+                ctx.strokeStyle = colors.waferStroke;
+                drawFlat(ctx, px);
+                ctx.setLineDash([]);
             }
+            ctx.setTransform(1, 0, 0, 1, 0, 0);
 
-            // Draw center crosshair
+            // Draw center crosshair; its 1px lines sit on pixel centres
+            const crossX = originX + 0.5;
+            const crossY = originY + 0.5;
             ctx.beginPath();
-            ctx.moveTo(centerX + offsetX - 15, centerY + offsetY);
-            ctx.lineTo(centerX + offsetX + 15, centerY + offsetY);
-            ctx.moveTo(centerX + offsetX, centerY + offsetY - 15);
-            ctx.lineTo(centerX + offsetX, centerY + offsetY + 15);
-            ctx.strokeStyle = isDark ? 'rgba(168, 85, 247, 0.8)' : 'rgba(168, 85, 247, 0.6)';
+            ctx.moveTo(crossX - 15, crossY);
+            ctx.lineTo(crossX + 15, crossY);
+            ctx.moveTo(crossX, crossY - 15);
+            ctx.lineTo(crossX, crossY + 15);
+            ctx.strokeStyle = colors.crosshair;
             ctx.lineWidth = 1;
             ctx.stroke();
         }
 
+        // Drop the error shake's layer promotion once the animation is over
+        document.getElementById('errorMessage').addEventListener('animationend', (e) => {
+            e.currentTarget.style.willChange = 'auto';
+        });
+
         // Calculate button
         document.getElementById('calculateBtn').addEventListener('click', calculate);
 
+        // Numeric inputs sent to /calculate, read from the cached els refs
+        const CALC_FIELDS = ['wafer', 'die_width', 'die_height', 'scribe', 'edge', 'flat_length', 'notch_depth'];
+        // Checkbox query parameters and the els key of the checkbox behind each
+        const CALC_FLAGS = Object.freeze({
+            include_partial: 'includePartial',
+            align_x: 'alignX',
+            align_y: 'alignY',
+        });
+
+        // Query parameters for /calculate from the current form state
+        function calcParams() {
+            const params = new URLSearchParams();
+            for (const field of CALC_FIELDS) params.append(field, els[field].value);
+            for (const [param, key] of Object.entries(CALC_FLAGS)) {
+                params.append(param, els[key].checked ? '1' : '0');
+            }
+            return params;
+        }
+
+        // Aborts the in-flight /calculate request when a newer one starts, so a
+        // slow stale response can never overwrite a newer result
+        let calcAbort = null;
+
         async function calculate() {
             const errorMessage = document.getElementById('errorMessage');
-            const emptyState = document.getElementById('emptyState');
-            const coordOverlay = document.getElementById('coordOverlay');
+            const { emptyState, coordOverlay } = els;
 
             errorMessage.classList.remove('show');
+            errorMessage.style.willChange = '';
 
-            const params = new URLSearchParams({
-                wafer: document.getElementById('wafer').value,
-                die_width: document.getElementById('die_width').value,
-                die_height: document.getElementById('die_height').value,
-                scribe: document.getElementById('scribe').value,
-                edge: document.getElementById('edge').value,
-                flat_length: document.getElementById('flat_length').value,
-                notch_depth: document.getElementById('notch_depth').value,
-                include_partial: document.getElementById('includePartial').checked ? '1' : '0',
-                align_x: document.getElementById('alignX').checked ? '1' : '0',
-                align_y: document.getElementById('alignY').checked ? '1' : '0'
-            });
+            const query = calcParams().toString();
+
+            if (calcAbort) calcAbort.abort();
+            const controller = new AbortController();
+            calcAbort = controller;
 
             try {
-                const response = await fetch('/calculate?' + params.toString());
+                const response = await fetch('/calculate?' + query, { signal: controller.signal });
                 const data = await response.json();
+                if (calcAbort === controller) calcAbort = null;
 
                 if (data.error) {
                     errorMessage.textContent = data.error;
@@ -1963,15 +2353,19 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 emptyState.style.display = 'none';
                 coordOverlay.style.display = 'block';
 
-                // Update scale, fit to screen, and draw
+                // Update scale and fit to screen; fitToScreen schedules the draw
+                attachDieColumns(data);
+                data.lastQuery = query;
                 currentData = data;
+                buildOutlinePaths(data);
                 baseScale = 200 / data.wafer_radius;
                 fitToScreen();
-                drawWafer(data);
 
                 showToast('Calculation Complete', `${data.full_dies} full dies, ${data.partial_dies} partial`, 'success');
 
             } catch (err) {
+                // Superseded by a newer calculation
+                if (err.name === 'AbortError') return;
                 errorMessage.textContent = 'Error: ' + err.message;
                 errorMessage.classList.add('show');
                 showToast('Error', err.message, 'error');
@@ -1984,7 +2378,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             document.getElementById('statFullDies').style.display = 'block';
             document.getElementById('fullDiesValue').textContent = data.full_dies;
             
-            if (document.getElementById('includePartial').checked) {
+            if (els.includePartial.checked) {
                 document.getElementById('statPartialDies').style.display = 'block';
                 document.getElementById('partialDiesValue').textContent = data.partial_dies;
             } else {
@@ -2004,8 +2398,8 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             document.getElementById('statusDieCount').textContent = data.full_dies;
             const statusMessage = document.getElementById('statusMessage');
             if (data.die_positions_limited) {
-                statusMessage.textContent = `Showing ${data.die_positions.length} of ${data.total_die_positions} dies`;
-                showToast('Visualization Limited', `Rendering ${data.die_positions.length} of ${data.total_die_positions} dies for performance.`, 'warning');
+                statusMessage.textContent = `Showing ${data.die_center_x.length} of ${data.total_die_positions} dies`;
+                showToast('Visualization Limited', `Rendering ${data.die_center_x.length} of ${data.total_die_positions} dies for performance.`, 'warning');
             } else {
                 statusMessage.textContent = 'Ready';
             }
@@ -2023,20 +2417,16 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             offsetX = 0;
             offsetY = 0;
             updateZoomDisplay();
-            if (currentData) {
-                drawWafer(currentData);
-            }
+            scheduleDraw();
         }
 
         function fitToScreen() {
             if (!currentData) return;
-            const canvas = document.getElementById('waferCanvas');
-            const wrapper = document.getElementById('canvasWrapper');
             const waferRadius = currentData.wafer_radius;
             const padding = 40;
             
-            const availableWidth = wrapper.clientWidth - padding * 2;
-            const availableHeight = wrapper.clientHeight - padding * 2;
+            const availableWidth = wrapperW - padding * 2;
+            const availableHeight = wrapperH - padding * 2;
             const scaleX = availableWidth / (waferRadius * 2);
             const scaleY = availableHeight / (waferRadius * 2);
             
@@ -2045,11 +2435,11 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             offsetY = 0;
             
             updateZoomDisplay();
-            drawWafer(currentData);
+            scheduleDraw();
         }
 
         function updateZoomDisplay() {
-            document.getElementById('zoomLevel').textContent = Math.round(zoomScale * 100) + '%';
+            els.zoomLevel.textContent = Math.round(zoomScale * 100) + '%';
         }
 
         const MIN_ZOOM = 0.5;  // Minimum 50% zoom
@@ -2058,56 +2448,79 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         function zoomIn() {
             zoomScale = Math.min(zoomScale * 1.2, MAX_ZOOM);
             updateZoomDisplay();
-            if (currentData) {
-                drawWafer(currentData);
-            }
+            scheduleDraw();
         }
 
         function zoomOut() {
             zoomScale = Math.max(zoomScale / 1.2, MIN_ZOOM);
             updateZoomDisplay();
-            if (currentData) {
-                drawWafer(currentData);
-            }
+            scheduleDraw();
         }
 
-        // Layer toggles
-        document.getElementById('layerWafer').addEventListener('change', (e) => {
-            layerVisibility.wafer = e.target.checked;
-            if (currentData) drawWafer(currentData);
+        // Layer toggles: one delegated listener maps each checkbox to its
+        // visibility flag and only redraws when the flag actually flips
+        const layerToggleKeys = Object.freeze({
+            layerWafer: 'wafer',
+            layerUsable: 'usable',
+            layerDieFull: 'dieFull',
+            layerDiePartial: 'diePartial',
         });
-        document.getElementById('layerUsable').addEventListener('change', (e) => {
-            layerVisibility.usable = e.target.checked;
-            if (currentData) drawWafer(currentData);
-        });
-        document.getElementById('layerDieFull').addEventListener('change', (e) => {
-                layerVisibility.dieFull = e.target.checked;
-                if (currentData) drawWafer(currentData);
-            });
-        document.getElementById('layerDiePartial').addEventListener('change', (e) => {
-            layerVisibility.diePartial = e.target.checked;
-            if (currentData) drawWafer(currentData);
+        const layerDiePartialToggle = document.getElementById('layerDiePartial');
+
+        function setLayerVisible(key, visible) {
+            if (layerVisibility[key] === visible) return;
+            layerVisibility[key] = visible;
+            scheduleDraw();
+        }
+
+        document.querySelector('.layer-toggles').addEventListener('change', (e) => {
+            const key = layerToggleKeys[e.target.id];
+            if (key) setLayerVisible(key, e.target.checked);
         });
 
         document.getElementById('includePartial').addEventListener('change', (e) => {
-            layerVisibility.diePartial = e.target.checked;
-            document.getElementById('layerDiePartial').checked = e.target.checked;
-            document.getElementById('layerDiePartial').disabled = !e.target.checked;
-            if (currentData) drawWafer(currentData);
+            const checked = e.target.checked;
+            layerDiePartialToggle.checked = checked;
+            layerDiePartialToggle.disabled = !checked;
+            setLayerVisible('diePartial', checked);
         });
+
         // Canvas event listeners
         const canvas = document.getElementById('waferCanvas');
-        const wrapper = document.getElementById('canvasWrapper');
+        const bgCanvas = document.getElementById('waferBgCanvas');
+        // Both visible contexts are created once. desynchronized lets browsers that
+        // support it present pan/zoom frames without waiting on the compositor;
+        // alpha stays on because the die layer is composited over the background.
+        const canvasCtx = canvas.getContext('2d', { desynchronized: true });
+        const bgCtx = bgCanvas.getContext('2d', { desynchronized: true });
+        const wrapper = els.canvasWrapper;
+
+        // Wrapper size, kept current by the ResizeObserver below so that sizing
+        // code never has to read layout
+        let wrapperW = wrapper.clientWidth;
+        let wrapperH = wrapper.clientHeight;
 
         function resizeCanvas() {
-            canvas.width = wrapper.clientWidth;
-            canvas.height = wrapper.clientHeight;
+            canvas.width = bgCanvas.width = wrapperW;
+            canvas.height = bgCanvas.height = wrapperH;
+            staticKey = null;  // Resizing cleared the background
+            // Redraw synchronously: resizing has just blanked both canvases, and this
+            // runs after the frame's rAF callbacks, so a scheduled draw would leave
+            // one empty frame on screen
             if (currentData) {
                 drawWafer(currentData);
             }
         }
 
-        window.addEventListener('resize', resizeCanvas);
+        new ResizeObserver(([entry]) => {
+            const width = Math.round(entry.contentRect.width);
+            const height = Math.round(entry.contentRect.height);
+            // The first observation reports the size already applied below
+            if (width === wrapperW && height === wrapperH) return;
+            wrapperW = width;
+            wrapperH = height;
+            resizeCanvas();
+        }).observe(wrapper);
         resizeCanvas();
 
         canvas.addEventListener('mousedown', (e) => {
@@ -2117,7 +2530,41 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             canvas.style.cursor = 'grabbing';
         });
 
+        // Cursor readouts are written at most once per frame, whatever the mouse rate,
+        // and only the values that changed are written
+        let pendingX = 0;
+        let pendingY = 0;
+        let coordFrame = 0;
+        let lastMmX = '';
+        let lastMmY = '';
+
+        function flushCoords() {
+            coordFrame = 0;
+            const mmX = pendingX.toFixed(2);
+            const mmY = pendingY.toFixed(2);
+            if (mmX === lastMmX && mmY === lastMmY) return;
+            if (mmX !== lastMmX) els.mouseX.textContent = mmX;
+            if (mmY !== lastMmY) els.mouseY.textContent = mmY;
+            if (!lastMmX) els.mouseCoords.style.display = 'flex';
+            lastMmX = mmX;
+            lastMmY = mmY;
+            els.statusMouseCoords.textContent = `${mmX}, ${mmY}`;
+        }
+
         canvas.addEventListener('mousemove', (e) => {
+            // Panning keeps the same wafer point under the cursor, so the readout
+            // would not change; skip the rect read and coordinate math while dragging
+            if (isDragging) {
+                if (currentData) {
+                    offsetX += e.clientX - lastMouseX;
+                    offsetY += e.clientY - lastMouseY;
+                    lastMouseX = e.clientX;
+                    lastMouseY = e.clientY;
+                    scheduleDraw();
+                }
+                return;
+            }
+
             const rect = canvas.getBoundingClientRect();
             const x = e.clientX - rect.left;
             const y = e.clientY - rect.top;
@@ -2125,26 +2572,10 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             // Update coordinate display
             const centerX = canvas.width / 2;
             const centerY = canvas.height / 2;
-            const scale = baseScale * zoomScale;
-            const toCanvasX = (x) => centerX + offsetX + (x * scale);
-            const toCanvasY = (y) => centerY + offsetY - (y * scale);
-            const mmX = ((x - centerX - offsetX) / scale).toFixed(2);
-            const mmY = ((centerY + offsetY - y) / scale).toFixed(2);
-            
-            document.getElementById('mouseX').textContent = mmX;
-            document.getElementById('mouseY').textContent = mmY;
-            document.getElementById('statusMouseCoords').textContent = `${mmX}, ${mmY}`;
-            document.getElementById('mouseCoords').style.display = 'flex';
-
-            if (isDragging && currentData) {
-                const deltaX = e.clientX - lastMouseX;
-                const deltaY = e.clientY - lastMouseY;
-                offsetX += deltaX;
-                offsetY += deltaY;
-                lastMouseX = e.clientX;
-                lastMouseY = e.clientY;
-                drawWafer(currentData);
-            }
+            const invScale = 1 / (baseScale * zoomScale);
+            pendingX = (x - centerX - offsetX) * invScale;
+            pendingY = (centerY + offsetY - y) * invScale;
+            if (!coordFrame) coordFrame = requestAnimationFrame(flushCoords);
         });
 
         canvas.addEventListener('mouseup', () => {
@@ -2157,13 +2588,34 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             canvas.style.cursor = 'crosshair';
         });
 
+        // Wheel deltas are summed in pixels and applied once per frame; ~100px of
+        // delta is one 1.2x step, capped at five steps per frame
+        let wheelAccum = 0;
+        let wheelScheduled = false;
+
+        // Approximate pixels per wheel delta unit for each WheelEvent.deltaMode
+        // (pixel, line as in Firefox, page)
+        const WHEEL_LINE_PX = 16;
+        function wheelDeltaPx(e) {
+            if (e.deltaMode === WheelEvent.DOM_DELTA_LINE) return e.deltaY * WHEEL_LINE_PX;
+            if (e.deltaMode === WheelEvent.DOM_DELTA_PAGE) return e.deltaY * window.innerHeight;
+            return e.deltaY;
+        }
+
         canvas.addEventListener('wheel', (e) => {
             e.preventDefault();
-            if (e.deltaY < 0) {
-                zoomIn();
-            } else {
-                zoomOut();
-            }
+            wheelAccum += wheelDeltaPx(e);
+            if (wheelScheduled) return;
+            wheelScheduled = true;
+            requestAnimationFrame(() => {
+                const steps = Math.min(Math.abs(wheelAccum) / 100, 5);
+                const factor = Math.pow(1.2, -Math.sign(wheelAccum) * steps);
+                zoomScale = Math.max(MIN_ZOOM, Math.min(MAX_ZOOM, zoomScale * factor));
+                wheelAccum = 0;
+                wheelScheduled = false;
+                updateZoomDisplay();
+                scheduleDraw();
+            });
         }, { passive: false });
 
         // Toolbar button event listeners
@@ -2183,9 +2635,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
         }
 
         function drawGrid(ctx, width, height, centerX, centerY, scale) {
-            const isDark = document.documentElement.getAttribute('data-theme') === 'dark';
-            const gridColor = isDark ? 'rgba(168, 85, 247, 0.08)' : 'rgba(168, 85, 247, 0.05)';
-            const majorGridColor = isDark ? 'rgba(168, 85, 247, 0.15)' : 'rgba(168, 85, 247, 0.1)';
+            const colors = themeColors;
             
             // Calculate grid spacing based on zoom level - use adaptive spacing
             let baseGridSize = 10; // mm
@@ -2195,262 +2645,430 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             
             const gridSize = baseGridSize * scale;
             
-            ctx.save();
-            
+            // Grid lines are snapped to pixel centres and kept as one Path2D,
+            // rebuilt only when the canvas size or grid spacing changes
+            const key = `${width}|${height}|${gridSize}|${centerX}|${centerY}`;
+            if (key !== gridKey) {
+                gridKey = key;
+                gridPath = new Path2D();
+                const snap = (v) => (v | 0) + 0.5;
+
+                // The canvas centre is never negative, so starting at centre % gridSize
+                // and stepping forward covers every visible line exactly once.
+                // Vertical lines
+                for (let x = centerX % gridSize; x < width; x += gridSize) {
+                    gridPath.moveTo(snap(x), 0);
+                    gridPath.lineTo(snap(x), height);
+                }
+
+                // Horizontal lines
+                for (let y = centerY % gridSize; y < height; y += gridSize) {
+                    gridPath.moveTo(0, snap(y));
+                    gridPath.lineTo(width, snap(y));
+                }
+            }
+
+            // Every caller sets its own styles after the grid, so the few properties
+            // touched here are simply overwritten rather than saved and restored
+
             // Draw major grid lines only - skip minor dots for performance
-            ctx.strokeStyle = majorGridColor;
+            ctx.strokeStyle = colors.grid;
             ctx.lineWidth = 1;
+            ctx.stroke(gridPath);
             
-            // Batch line drawing for better performance
-            ctx.beginPath();
-            
-            // Vertical lines
-            for (let x = centerX % gridSize; x < width; x += gridSize) {
-                ctx.moveTo(x, 0);
-                ctx.lineTo(x, height);
-            }
-            for (let x = centerX % gridSize; x > 0; x -= gridSize) {
-                ctx.moveTo(x, 0);
-                ctx.lineTo(x, height);
-            }
-            
-            // Horizontal lines
-            for (let y = centerY % gridSize; y < height; y += gridSize) {
-                ctx.moveTo(0, y);
-                ctx.lineTo(width, y);
-            }
-            for (let y = centerY % gridSize; y > 0; y -= gridSize) {
-                ctx.moveTo(0, y);
-                ctx.lineTo(width, y);
-            }
-            
-            ctx.stroke();
-            
-            // Draw axes
-            ctx.strokeStyle = isDark ? 'rgba(168, 85, 247, 0.4)' : 'rgba(168, 85, 247, 0.3)';
+            // Draw X and Y axes, which share one style, as a single path
+            ctx.strokeStyle = colors.axis;
             ctx.lineWidth = 2;
-            
-            // X axis
             ctx.beginPath();
             ctx.moveTo(0, centerY + offsetY);
             ctx.lineTo(width, centerY + offsetY);
-            ctx.stroke();
-            
-            // Y axis
-            ctx.beginPath();
             ctx.moveTo(centerX + offsetX, 0);
             ctx.lineTo(centerX + offsetX, height);
             ctx.stroke();
 
             // Axis labels
-            ctx.fillStyle = isDark ? 'rgba(168, 85, 247, 0.8)' : 'rgba(168, 85, 247, 0.7)';
-            ctx.font = '12px var(--font-mono)';
-            ctx.textAlign = 'left';
-            ctx.textBaseline = 'middle';
-            ctx.fillText('+X', width - 28, centerY + offsetY - 10);
-            ctx.fillText('-X', 8, centerY + offsetY - 10);
-            ctx.textAlign = 'center';
-            ctx.textBaseline = 'top';
-            ctx.fillText('+Y', centerX + offsetX + 12, 8);
-            ctx.textBaseline = 'bottom';
-            ctx.fillText('-Y', centerX + offsetX + 12, height - 8);
-            
-            ctx.restore();
+            const plusX = axisLabel('+X', colors.axisLabel);
+            const minusX = axisLabel('-X', colors.axisLabel);
+            const plusY = axisLabel('+Y', colors.axisLabel);
+            const minusY = axisLabel('-Y', colors.axisLabel);
+            const labelY = centerY + offsetY - 10 - AXIS_LABEL_HEIGHT / 2;
+            ctx.drawImage(plusX, width - 28, labelY);
+            ctx.drawImage(minusX, 8, labelY);
+            ctx.drawImage(plusY, centerX + offsetX + 12 - plusY.width / 2, 8);
+            ctx.drawImage(minusY, centerX + offsetX + 12 - minusY.width / 2, height - 8 - AXIS_LABEL_HEIGHT);
+        }
+
+        // Axis labels are rendered once per theme into small sprites and blitted,
+        // so pans and zooms do not re-shape text
+        const AXIS_LABEL_HEIGHT = 16;
+        const axisLabelSprites = new Map();
+
+        function axisLabel(text, color) {
+            const key = `${text}|${color}`;
+            let sprite = axisLabelSprites.get(key);
+            if (!sprite) {
+                const font = '12px var(--font-mono)';
+                sprite = document.createElement('canvas');
+                const spriteCtx = sprite.getContext('2d');
+                spriteCtx.font = font;
+                sprite.width = Math.ceil(spriteCtx.measureText(text).width);
+                sprite.height = AXIS_LABEL_HEIGHT;
+                // Resizing resets the context state
+                spriteCtx.font = font;
+                spriteCtx.fillStyle = color;
+                spriteCtx.textBaseline = 'middle';
+                spriteCtx.fillText(text, 0, AXIS_LABEL_HEIGHT / 2);
+                axisLabelSprites.set(key, sprite);
+            }
+            return sprite;
         }
 
         function drawWafer(data) {
-            const canvas = document.getElementById('waferCanvas');
-            const ctx = canvas.getContext('2d');
-            const isDark = document.documentElement.getAttribute('data-theme') === 'dark';
-
-            ctx.clearRect(0, 0, canvas.width, canvas.height);
-
             const centerX = canvas.width / 2;
             const centerY = canvas.height / 2;
             const scale = baseScale * zoomScale;
+            const viewKey = `${canvas.width}|${canvas.height}|${scale}|${offsetX}|${offsetY}|${isDarkTheme}`;
+            const view = { centerX, centerY, scale, colors: themeColors, viewKey };
+
+            const { wafer: showWafer, usable: showUsable, flat: showFlat } = layerVisibility;
+            const key = [
+                data.wafer_radius, data.usable_radius, data.sagitta, data.flat_length, data.notch_depth,
+                viewKey, showWafer, showUsable, showFlat, layerConfig.usable.color,
+            ].join('|');
+            if (key !== staticKey) {
+                staticKey = key;
+                drawStaticLayers(bgCtx, data, view);
+            }
+            drawDynamicLayers(canvasCtx, data, view);
+        }
 
-            // Draw grid background
-            drawGrid(ctx, canvas.width, canvas.height, centerX, centerY, scale);
+        // Each toggleable layer is rendered into its own offscreen canvas and only
+        // re-rendered when its data or key (view, theme, colour) changes, so a
+        // visibility toggle just re-composites the cached layers
+        const layerCanvases = new Map();
 
-            // Draw wafer outline (including flat/notch area)
-            if (layerVisibility.wafer) {
-                ctx.beginPath();
-                ctx.arc(centerX + offsetX, centerY + offsetY, data.wafer_radius * scale, 0, 2 * Math.PI);
-                ctx.fillStyle = isDark ? 'rgba(100, 100, 100, 0.2)' : 'rgba(200, 200, 200, 0.3)';
-                ctx.fill();
-                ctx.strokeStyle = isDark ? '#666' : '#999';
-                ctx.lineWidth = 2;
-                ctx.stroke();
-
-                // Draw flat/notch area as part of wafer layer
-                if (data.sagitta > 0) {
-                    if (data.flat_length > 0) {
-                        const halfFlat = data.flat_length / 2;
-                        const flatY_canvas = data.wafer_radius - data.sagitta;
-                        const intersectX = Math.sqrt(2 * data.wafer_radius * data.sagitta - data.sagitta * data.sagitta);
-
-                        // Draw the flat chord
-                        ctx.beginPath();
-                        ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                        ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                        ctx.strokeStyle = isDark ? '#666' : '#999';
-                        ctx.lineWidth = 3;
-                        ctx.stroke();
-
-                        const angleToLeft = Math.atan2(flatY_canvas, -intersectX);
-                        const angleToRight = Math.atan2(flatY_canvas, intersectX);
-
-                        ctx.beginPath();
-                        ctx.arc(centerX + offsetX, centerY + offsetY, data.wafer_radius * scale, angleToLeft, angleToRight);
-                        ctx.strokeStyle = isDark ? '#666' : '#999';
-                        ctx.lineWidth = 2;
-                        ctx.setLineDash([3, 3]);
-                        ctx.stroke();
-                        ctx.setLineDash([]);
-
-                        ctx.save();
-                        ctx.beginPath();
-                        ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                        ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                        ctx.arc(centerX + offsetX, centerY + offsetY, data.wafer_radius * scale, angleToRight, angleToLeft, true);
-                        ctx.closePath();
-                        ctx.fillStyle = isDark ? 'rgba(100, 100, 100, 0.2)' : 'rgba(200, 200, 200, 0.3)';
-                        ctx.fill();
-                        ctx.restore();
-                    } else if (data.notch_depth > 0) {
-                        const flatY = data.wafer_radius - data.sagitta;
-                        const notchWidth = 2;
-
-                        ctx.beginPath();
-                        ctx.moveTo(centerX + offsetX - notchWidth * scale, centerY + offsetY + (flatY + data.sagitta) * scale);
-                        ctx.lineTo(centerX + offsetX, centerY + offsetY + flatY * scale);
-                        ctx.lineTo(centerX + offsetX + notchWidth * scale, centerY + offsetY + (flatY + data.sagitta) * scale);
-                        ctx.strokeStyle = isDark ? '#666' : '#999';
-                        ctx.lineWidth = 2;
-                        ctx.stroke();
-                    }
+        // Padding around centre-sized layers for the widest (3px) stroke, and how
+        // large such a layer may get relative to the view's longer side
+        const LAYER_PAD = 4;
+        const LAYER_MAX_RATIO = 1.5;
+
+        // Half the side of a square layer covering radius mm either side of the
+        // wafer centre at scale, or 0 when it would be much larger than the view
+        function centredLayerHalf(radius, scale) {
+            const half = Math.ceil(radius * scale) + LAYER_PAD;
+            return 2 * half <= LAYER_MAX_RATIO * Math.max(canvas.width, canvas.height) ? half : 0;
+        }
+
+        function renderLayer(name, data, key, draw, width = canvas.width, height = canvas.height) {
+            let layer = layerCanvases.get(name);
+            if (!layer) {
+                layer = { canvas: document.createElement('canvas'), data: null, key: '' };
+                layerCanvases.set(name, layer);
+            }
+            if (layer.data !== data || layer.key !== key) {
+                const target = layer.canvas;
+                const ctx = target.getContext('2d');
+                if (target.width !== width || target.height !== height) {
+                    target.width = width;
+                    target.height = height;
+                } else {
+                    ctx.clearRect(0, 0, target.width, target.height);
                 }
+                draw(ctx);
+                // Every render starts from the identity transform, solid lines and full alpha
+                ctx.setTransform(1, 0, 0, 1, 0, 0);
+                ctx.setLineDash([]);
+                ctx.globalAlpha = 1;
+                layer.data = data;
+                layer.key = key;
             }
+            return layer.canvas;
+        }
 
-            // Draw usable area
-            if (layerVisibility.usable) {
-                ctx.beginPath();
-                ctx.arc(centerX + offsetX, centerY + offsetY, data.usable_radius * scale, 0, 2 * Math.PI);
-                ctx.strokeStyle = layerConfig.usable.color;
-                ctx.setLineDash([5, 5]);
-                ctx.lineWidth = 2;
-                ctx.stroke();
-                ctx.setLineDash([]);
+        // Grid, wafer outline, flat/notch, usable area and crosshair (background canvas)
+        function drawStaticLayers(ctx, data, { centerX, centerY, scale, colors, viewKey }) {
+            const { wafer: showWafer, usable: showUsable, flat: showFlat } = layerVisibility;
+
+            ctx.clearRect(0, 0, ctx.canvas.width, ctx.canvas.height);
+
+            // Draw grid background
+            drawGrid(ctx, ctx.canvas.width, ctx.canvas.height, centerX, centerY, scale);
+
+            // Outline geometry is cached in mm; pan/zoom is applied by setTransform,
+            // so line widths and dashes are divided by the scale to stay in pixels
+            buildOutlinePaths(data);
+            const px = 1 / scale;
+            const showFlatNotch = flatNotchVisible(px);
+
+            // The wafer centre is snapped to a whole pixel, so the outline rasterizes
+            // the same at every pan position. While the wafer fits in a canvas about
+            // the size of the view, the outline layers are rendered wafer-sized around
+            // the centre and blitted at the pan position, so panning reuses them.
+            // Zoomed further in, they fall back to view-sized layers keyed on the
+            // full view.
+            const originX = Math.round(centerX + offsetX);
+            const originY = Math.round(centerY + offsetY);
+            const half = centredLayerHalf(data.wafer_radius, scale);
+            let outline;
+            if (half) {
+                outline = {
+                    key: `${half}|${scale}|${isDarkTheme}`,
+                    width: 2 * half,
+                    height: 2 * half,
+                    x: originX - half,
+                    y: originY - half,
+                    originX: half,
+                    originY: half,
+                };
+            } else {
+                outline = { key: viewKey, width: canvas.width, height: canvas.height, x: 0, y: 0, originX, originY };
             }
+            const toView = (layerCtx) => layerCtx.setTransform(scale, 0, 0, scale, outline.originX, outline.originY);
+            const drawOutlineLayer = (name, key, draw) => {
+                const layer = renderLayer(name, data, key, draw, outline.width, outline.height);
+                ctx.drawImage(layer, outline.x, outline.y);
+            };
 
-            // Draw flat/notch area
-            if (layerVisibility.flat && data.sagitta > 0) {
-                if (data.flat_length > 0) {
-                    const halfFlat = data.flat_length / 2;
-                    const flatY_canvas = data.wafer_radius - data.sagitta;
-                    const intersectX = Math.sqrt(2 * data.wafer_radius * data.sagitta - data.sagitta * data.sagitta);
-
-                    // Draw the flat chord
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.strokeStyle = '#ef4444';
-                    ctx.lineWidth = 3;
-                    ctx.stroke();
-
-                    const angleToLeft = Math.atan2(flatY_canvas, -intersectX);
-                    const angleToRight = Math.atan2(flatY_canvas, intersectX);
-
-                    ctx.beginPath();
-                    ctx.arc(centerX + offsetX, centerY + offsetY, data.wafer_radius * scale, angleToLeft, angleToRight);
-                    ctx.strokeStyle = '#ef4444';
-                    ctx.lineWidth = 2;
-                    ctx.setLineDash([3, 3]);
-                    ctx.stroke();
-                    ctx.setLineDash([]);
-
-                    ctx.save();
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.lineTo(centerX + offsetX + intersectX * scale, centerY + offsetY + flatY_canvas * scale);
-                    ctx.arc(centerX + offsetX, centerY + offsetY, data.wafer_radius * scale, angleToRight, angleToLeft, true);
-                    ctx.closePath();
-                    ctx.fillStyle = isDark ? 'rgba(239, 68, 68, 0.2)' : 'rgba(239, 68, 68, 0.15)';
-                    ctx.fill();
-                    ctx.restore();
-                } else if (data.notch_depth > 0) {
-                    const flatY = data.wafer_radius - data.sagitta;
-                    const notchWidth = 2;
-
-                    ctx.beginPath();
-                    ctx.moveTo(centerX + offsetX - notchWidth * scale, centerY + offsetY + (flatY + data.sagitta) * scale);
-                    ctx.lineTo(centerX + offsetX, centerY + offsetY + flatY * scale);
-                    ctx.lineTo(centerX + offsetX + notchWidth * scale, centerY + offsetY + (flatY + data.sagitta) * scale);
-                    ctx.strokeStyle = '#ef4444';
-                    ctx.lineWidth = 2;
-                    ctx.stroke();
-                }
+            // Draw wafer outline (including flat/notch area)
+            if (showWafer) {
+                drawOutlineLayer('wafer', outline.key, (layerCtx) => {
+                    toView(layerCtx);
+                    layerCtx.fillStyle = colors.waferFill;
+                    layerCtx.strokeStyle = colors.waferStroke;
+                    layerCtx.lineWidth = 2 * px;
+                    layerCtx.fill(waferPath);
+                    // A notch shares the outline's style and is stroked with it
+                    layerCtx.stroke(showFlatNotch && notchPath ? waferEdgePath : waferPath);
+                    if (showFlatNotch && flatChordPath) drawFlat(layerCtx, px);
+                });
             }
 
-            // Draw dies - batch by type for better performance
-            const fullDies = [];
-            const partialDies = [];
-            
-            data.die_positions.forEach(die => {
-                if (die.full && layerVisibility.dieFull) {
-                    fullDies.push(die);
-                } else if (!die.full && layerVisibility.diePartial) {
-                    partialDies.push(die);
-                }
-            });
-            
-            // Draw full dies
-            if (fullDies.length > 0) {
-                ctx.save();
-                ctx.globalAlpha = 0.7;
-                ctx.fillStyle = layerConfig.die.color;
-                ctx.strokeStyle = isDark ? 'rgba(255, 255, 255, 0.55)' : 'rgba(0, 0, 0, 0.5)';
-                ctx.lineWidth = 0.9;
-                fullDies.forEach(die => {
-                    const px = centerX + offsetX + die.x * scale;
-                    const py = centerY + offsetY + die.y * scale;
-                    const w = die.w * scale;
-                    const h = die.h * scale;
-                    ctx.fillRect(px, py, w, h);
-                    ctx.strokeRect(px, py, w, h);
+            // Draw usable area
+            if (showUsable) {
+                const color = layerConfig.usable.color;
+                drawOutlineLayer('usable', `${outline.key}|${color}`, (layerCtx) => {
+                    toView(layerCtx);
+                    layerCtx.strokeStyle = color;
+                    layerCtx.setLineDash([5 * px, 5 * px]);
+                    layerCtx.lineWidth = 2 * px;
+                    layerCtx.stroke(usablePath);
                 });
-                ctx.restore();
             }
-            
-            // Draw partial dies
-            if (partialDies.length > 0) {
-                ctx.save();
-                ctx.globalAlpha = 0.35;
-                ctx.fillStyle = layerConfig.diePartial.color;
-                ctx.strokeStyle = isDark ? 'rgba(255, 255, 255, 0.55)' : 'rgba(0, 0, 0, 0.5)';
-                ctx.lineWidth = 0.9;
-                partialDies.forEach(die => {
-                    const px = centerX + offsetX + die.x * scale;
-                    const py = centerY + offsetY + die.y * scale;
-                    const w = die.w * scale;
-                    const h = die.h * scale;
-                    ctx.fillRect(px, py, w, h);
-                    ctx.strokeRect(px, py, w, h);
+
+            // Draw flat/notch area
+            if (showFlat && showFlatNotch) {
+                drawOutlineLayer('flat', outline.key, (layerCtx) => {
+                    toView(layerCtx);
+                    layerCtx.strokeStyle = '#ef4444';
+                    layerCtx.fillStyle = colors.flatFill;
+                    layerCtx.lineWidth = 2 * px;
+                    if (flatChordPath) {
+                        drawFlat(layerCtx, px);
+                    } else {
+                        layerCtx.stroke(notchPath);
+                    }
                 });
-                ctx.restore();
             }
 
-            // Draw center crosshair
+            // Draw center crosshair; its 1px lines sit on pixel centres
+            const crossX = originX + 0.5;
+            const crossY = originY + 0.5;
             ctx.beginPath();
-            ctx.moveTo(centerX + offsetX - 15, centerY + offsetY);
-            ctx.lineTo(centerX + offsetX + 15, centerY + offsetY);
-            ctx.moveTo(centerX + offsetX, centerY + offsetY - 15);
-            ctx.lineTo(centerX + offsetX, centerY + offsetY + 15);
-            ctx.strokeStyle = isDark ? 'rgba(168, 85, 247, 0.8)' : 'rgba(168, 85, 247, 0.6)';
+            ctx.moveTo(crossX - 15, crossY);
+            ctx.lineTo(crossX + 15, crossY);
+            ctx.moveTo(crossX, crossY - 15);
+            ctx.lineTo(crossX, crossY + 15);
+            ctx.strokeStyle = colors.crosshair;
             ctx.lineWidth = 1;
             ctx.stroke();
         }
 
+        // Half-width of the drawn notch V, in mm
+        const NOTCH_WIDTH = 2;
+
+        // Whether the cached flat or notch is visible at px mm per pixel. A flat
+        // less than half a pixel deep or a notch under a pixel wide is skipped.
+        function flatNotchVisible(px) {
+            if (pathSource.sagitta < 0.5 * px) return false;
+            return flatChordPath !== null || (notchPath !== null && NOTCH_WIDTH >= px);
+        }
+
+        // Strokes the cached flat chord, then the dashed outline of the cut-off
+        // segment and fills it, with the caller's stroke and fill styles. The
+        // segment shares one path for the dashed arc and the fill; its dashed
+        // chord lies inside the wider solid one. Leaves the dash set.
+        function drawFlat(ctx, px) {
+            ctx.lineWidth = 3 * px;
+            ctx.stroke(flatChordPath);
+            ctx.lineWidth = 2 * px;
+            ctx.setLineDash([3 * px, 3 * px]);
+            ctx.stroke(flatPath);
+            ctx.fill(flatPath);
+        }
+
+        // Rebuilds the mm-space outline paths when the wafer geometry changes
+        function buildOutlinePaths(data) {
+            // A calculation result never changes once received, so per-frame calls
+            // for the same object return before building the key
+            if (data === pathSource) return;
+            pathSource = data;
+            const key = `${data.wafer_radius}|${data.usable_radius}|${data.sagitta}|${data.flat_length}|${data.notch_depth}`;
+            if (key === pathKey) return;
+            pathKey = key;
+
+            const r = data.wafer_radius;
+            const sagitta = data.sagitta;
+            waferPath = new Path2D();
+            waferPath.arc(0, 0, r, 0, 2 * Math.PI);
+            usablePath = new Path2D();
+            usablePath.arc(0, 0, Math.max(data.usable_radius, 0), 0, 2 * Math.PI);
+            flatChordPath = flatPath = notchPath = null;
+            waferEdgePath = waferPath;
+            if (!(sagitta > 0)) return;
+
+            const flatY = r - sagitta;
+            if (data.flat_length > 0) {
+                const intersectX = Math.sqrt(sagitta * (2 * r - sagitta));
+                const angleToLeft = Math.atan2(flatY, -intersectX);
+                const angleToRight = Math.atan2(flatY, intersectX);
+
+                flatChordPath = new Path2D();
+                flatChordPath.moveTo(-intersectX, flatY);
+                flatChordPath.lineTo(intersectX, flatY);
+
+                // The cut-off segment: chord plus arc, both stroked and filled
+                flatPath = new Path2D(flatChordPath);
+                flatPath.arc(0, 0, r, angleToRight, angleToLeft, true);
+                flatPath.closePath();
+            } else if (data.notch_depth > 0) {
+                notchPath = new Path2D();
+                notchPath.moveTo(-NOTCH_WIDTH, flatY + sagitta);
+                notchPath.lineTo(0, flatY);
+                notchPath.lineTo(NOTCH_WIDTH, flatY + sagitta);
+                waferEdgePath = new Path2D(waferPath);
+                waferEdgePath.addPath(notchPath);
+            }
+        }
+
+        // Dies (foreground canvas)
+        // Copies the die centre columns of a /calculate result into typed columns
+        // (dieX, dieY as die top-left corners in mm, dieFull as a 0/1 mask) once on
+        // receipt, and buckets the die indices into fullIdx and partialIdx
+        function attachDieColumns(data) {
+            const centerX = data.die_center_x;
+            const centerY = data.die_center_y;
+            const count = centerX.length;
+            const halfW = data.effective_width / 2;
+            const halfH = data.effective_height / 2;
+            const dieX = new Float32Array(count);
+            const dieY = new Float32Array(count);
+            const dieFull = Uint8Array.from(data.die_full);
+            let fullCount = 0;
+            // Largest distance of a die edge from the centre along either axis, in mm
+            let extent = 0;
+            for (let i = 0; i < count; i++) {
+                dieX[i] = centerX[i] - halfW;
+                dieY[i] = centerY[i] - halfH;
+                fullCount += dieFull[i];
+                extent = Math.max(extent, Math.abs(centerX[i]) + halfW, Math.abs(centerY[i]) + halfH);
+            }
+
+            const fullIdx = new Uint32Array(fullCount);
+            const partialIdx = new Uint32Array(count - fullCount);
+            for (let i = 0, f = 0, p = 0; i < count; i++) {
+                if (dieFull[i]) fullIdx[f++] = i;
+                else partialIdx[p++] = i;
+            }
+
+            data.dieX = dieX;
+            data.dieY = dieY;
+            data.dieFull = dieFull;
+            data.dieExtent = extent;
+            data.fullIdx = fullIdx;
+            data.partialIdx = partialIdx;
+        }
+
+        // Full and partial die rects, one Path2D per kind so each layer is a single
+        // fill and stroke. Rects are in whole pixels from the wafer centre at the
+        // current scale, so they are rebuilt on zoom but not on pan. Each kind is
+        // built from its own index bucket, and only once its layer is shown.
+        const diePaths = {
+            full: { data: null, scale: 0, path: null },
+            partial: { data: null, scale: 0, path: null },
+        };
+
+        function buildDiePath(data, scale, full) {
+            const cache = full ? diePaths.full : diePaths.partial;
+            if (cache.data === data && cache.scale === scale) return cache.path;
+            const path = new Path2D();
+            const w = Math.max(1, Math.round(data.effective_width * scale));
+            const h = Math.max(1, Math.round(data.effective_height * scale));
+            const { dieX, dieY } = data;
+            const indices = full ? data.fullIdx : data.partialIdx;
+            for (let k = 0, n = indices.length; k < n; k++) {
+                const i = indices[k];
+                path.rect(Math.round(dieX[i] * scale), Math.round(dieY[i] * scale), w, h);
+            }
+            cache.data = data;
+            cache.scale = scale;
+            cache.path = path;
+            return path;
+        }
+
+        function drawDynamicLayers(ctx, data, { centerX, centerY, scale, colors }) {
+            const { dieFull: showDieFull, diePartial: showDiePartial } = layerVisibility;
+
+            ctx.clearRect(0, 0, ctx.canvas.width, ctx.canvas.height);
+
+            // Draw dies. Die rects are whole pixels from the centre; translating by
+            // the rounded centre plus half a pixel keeps both fills and the thin
+            // strokes on the pixel grid.
+            const originX = Math.round(centerX + offsetX);
+            const originY = Math.round(centerY + offsetY);
+            const drawDies = (dieCtx, x, y, full, color, alpha) => {
+                dieCtx.setTransform(1, 0, 0, 1, x + 0.5, y + 0.5);
+                dieCtx.globalAlpha = alpha;
+                dieCtx.fillStyle = color;
+                dieCtx.strokeStyle = colors.dieStroke;
+                dieCtx.lineWidth = 0.9;
+                const path = buildDiePath(data, scale, full);
+                dieCtx.fill(path);
+                dieCtx.stroke(path);
+            };
+
+            // While the die area fits in a canvas about the size of the view, each
+            // die type is cached in a layer of that size around the centre and
+            // blitted at the pan position, so panning reuses it. Zoomed further in,
+            // a layer keyed on the pan offset would be rebuilt every pan frame, so
+            // the dies are drawn straight onto the canvas instead.
+            const half = centredLayerHalf(data.dieExtent, scale);
+            const dieType = (name, full, color, alpha) => {
+                if (half) {
+                    const key = `${half}|${scale}|${color}|${isDarkTheme}`;
+                    const layer = renderLayer(name, data, key, (layerCtx) => {
+                        drawDies(layerCtx, half, half, full, color, alpha);
+                    }, 2 * half, 2 * half);
+                    ctx.drawImage(layer, originX - half, originY - half);
+                } else {
+                    drawDies(ctx, originX, originY, full, color, alpha);
+                    ctx.setTransform(1, 0, 0, 1, 0, 0);
+                    ctx.globalAlpha = 1;
+                }
+            };
+
+            // Draw full dies
+            if (showDieFull) dieType('dieFull', true, layerConfig.die.color, 0.7);
+
+            // Draw partial dies
+            if (showDiePartial) dieType('diePartial', false, layerConfig.diePartial.color, 0.35);
+        }
+
+        const TOAST_SLIDE_IN = [
+            { transform: 'translate3d(100%, 0, 0)', opacity: 0 },
+            { transform: 'translate3d(0, 0, 0)', opacity: 1 },
+        ];
+        const TOAST_SLIDE_OUT = [...TOAST_SLIDE_IN].reverse();
+
         function showToast(title, message, type = 'info') {
             const container = document.getElementById('toastContainer');
             const toast = document.createElement('div');
@@ -2461,19 +3079,26 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             `;
             container.appendChild(toast);
 
+            // Slide in and out with the Web Animations API; the element is only
+            // layer-promoted while one of the animations runs
+            const timing = { duration: 300, easing: 'ease', fill: 'forwards' };
+            toast.style.willChange = 'transform, opacity';
+            toast.animate(TOAST_SLIDE_IN, timing).finished.then(() => {
+                toast.style.willChange = 'auto';
+            });
+
             setTimeout(() => {
-                toast.classList.add('hiding');
-                setTimeout(() => {
-                    container.removeChild(toast);
-                }, 300);
+                toast.style.willChange = 'transform, opacity';
+                toast.animate(TOAST_SLIDE_OUT, timing).finished.then(() => toast.remove());
             }, 3000);
         }
 
-        // Sidebar section toggle
-        function toggleSection(sectionId) {
-            const section = document.getElementById(sectionId);
-            section.classList.toggle('collapsed');
-        }
+        // Sidebar section collapse, delegated from the shared container
+        document.querySelector('.main-container').addEventListener('click', (e) => {
+            const header = e.target.closest('.sidebar-header');
+            if (!header) return;
+            document.getElementById(header.dataset.section).classList.toggle('collapsed');
+        });
 
         async function exportGdsii() {
             const btn = document.getElementById('exportGdsiiBtn');
@@ -2481,33 +3106,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             btn.innerHTML = '<span>⏳</span> Exporting...';
 
             try {
-                const params = new URLSearchParams();
-                const wafer = document.getElementById('wafer').value || '100';
-                const dieWidth = document.getElementById('die_width').value || '10';
-                const dieHeight = document.getElementById('die_height').value || '10';
-                const scribe = document.getElementById('scribe').value || '0.1';
-                const edge = document.getElementById('edge').value || '3';
-                const flatLength = document.getElementById('flat_length').value || '0';
-                const notchDepth = document.getElementById('notch_depth').value || '0';
-
-                params.append('wafer', wafer);
-                params.append('die_width', dieWidth);
-                params.append('die_height', dieHeight);
-                params.append('scribe', scribe);
-                params.append('edge', edge);
-                params.append('flat_length', flatLength);
-                params.append('notch_depth', notchDepth);
-
-                params.append('layer_wafer', layerConfig.wafer.layer);
-                params.append('datatype_wafer', layerConfig.wafer.datatype);
-                params.append('layer_usable', layerConfig.usable.layer);
-                params.append('datatype_usable', layerConfig.usable.datatype);
-                params.append('layer_die', layerConfig.die.layer);
-                params.append('datatype_die', layerConfig.die.datatype);
-
-                params.append('include_partial', document.getElementById('includePartial').checked ? '1' : '0');
-                params.append('align_x', document.getElementById('alignX').checked ? '1' : '0');
-                params.append('align_y', document.getElementById('alignY').checked ? '1' : '0');
+                // Reuse the query of the displayed result, so the export matches the
+                // preview without re-reading the form and the server reuses its
+                // cached die scan
+                const params = currentData ? new URLSearchParams(currentData.lastQuery) : calcParams();
+                for (const kind of ['wafer', 'usable', 'die']) {
+                    params.append(`layer_${kind}`, layerConfig[kind].layer);
+                    params.append(`datatype_${kind}`, layerConfig[kind].datatype);
+                }
 
                 const response = await fetch('/export_gdsii?' + params.toString());
                 if (!response.ok) {
@@ -2523,7 +3129,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                     ? customName
                     : (currentData
                         ? `${Math.round(currentData.wafer_diameter)}mm_${currentData.full_dies}dies`
-                        : `${Math.round(parseFloat(wafer))}mm_layout`);
+                        : `${Math.round(parseFloat(params.get('wafer')))}mm_layout`);
                 const fileName = fileTag.endsWith('.gds') ? fileTag : `wafer_${fileTag}.gds`;
                 a.download = fileName;
                 document.body.appendChild(a);
@@ -2545,7 +3151,14 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 return;
             }
 
-            const canvas = document.getElementById('waferCanvas');
+            // Flatten the background and foreground layers into one image
+            const image = document.createElement('canvas');
+            image.width = canvas.width;
+            image.height = canvas.height;
+            const imageCtx = image.getContext('2d');
+            imageCtx.drawImage(bgCanvas, 0, 0);
+            imageCtx.drawImage(canvas, 0, 0);
+
             const link = document.createElement('a');
             const customName = document.getElementById('exportFilename').value.trim();
             const fileTag = customName
@@ -2553,7 +3166,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
                 : `${Math.round(currentData.wafer_diameter)}mm_${currentData.full_dies}dies`;
             const fileName = fileTag.endsWith('.png') ? fileTag : `wafer_${fileTag}.png`;
             link.download = fileName;
-            link.href = canvas.toDataURL();
+            link.href = image.toDataURL();
             link.click();
 
             showToast('Export Complete', 'PNG image downloaded successfully', 'success');
@@ -2563,33 +3176,271 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
             showToast('Export Disabled', 'SVG export has been removed from the sidebar.', 'warning');
         }
 
-        // Initialize first section as collapsed for better layout
-        toggleSection('sectionInfo');
-        updateLayerMeta();
+        scheduleLayerMeta();
         applyStandardSize(document.getElementById('standard_size').value, false);
         
         // Initialize baseScale and draw initial wafer outline
         baseScale = 200 / 50; // Default for 100mm wafer (50mm radius)
+        readOutlineInputs();
         drawWaferOutline();
     </script>
 </body>
 </html>'''
 
+def _static_asset(text, content_type):
+    """Encode an embedded asset once and tag it with a short content hash."""
+    body = text.encode('utf-8')
+    return {
+        'body': body,
+        'content_type': content_type,
+        'version': hashlib.sha1(body).hexdigest()[:12],
+    }
+
+
+# The page and its assets never change at runtime, so encode them once instead
+# of per request. Asset URLs carry a content hash so browsers can cache them
+# indefinitely.
+STATIC_ASSETS = {
+    '/static/deferred.css': _static_asset(DEFERRED_CSS, 'text/css; charset=utf-8'),
+    '/static/lyp-parser.js': _static_asset(LYP_PARSER_JS, 'text/javascript; charset=utf-8'),
+}
+HTML_PAGE = (
+    HTML_TEMPLATE
+    .replace('__DEFERRED_CSS_VERSION__', STATIC_ASSETS['/static/deferred.css']['version'])
+    .replace('__LYP_PARSER_VERSION__', STATIC_ASSETS['/static/lyp-parser.js']['version'])
+    .encode('utf-8')
+)
+
+
+# Size of the slices a response body is written to the socket in
+RESPONSE_WRITE_CHUNK = 64 * 1024
+# Bodies smaller than this are sent uncompressed, where gzip saves too little
+# to be worth the CPU. Level 1 keeps most of the ratio of the default level at
+# a fraction of the cost.
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 1
+
+
+# Compact separators trim every response body, and the payloads are plain
+# dicts and lists built by this module, so the circular-reference check is
+# skipped. encode() still runs on the C accelerated encoder.
+_JSON_ENCODER = json.JSONEncoder(separators=(',', ':'), check_circular=False)
+
+
+def encode_json(obj):
+    """Serialize a JSON response body.
+
+    Args:
+        obj: JSON-compatible value
+
+    Returns:
+        UTF-8 encoded compact JSON bytes
+    """
+    return _JSON_ENCODER.encode(obj).encode()
+
+
+# Feedback webhook posts are sent by a background worker so a slow webhook
+# never holds up the request thread
+FEEDBACK_WEBHOOK_QUEUE = queue.Queue(maxsize=100)
+FEEDBACK_WEBHOOK_RETRIES = 3
+# An identical post within this many seconds of the last one is dropped
+FEEDBACK_DEDUPE_SECONDS = 60
+_feedback_worker_lock = threading.Lock()
+_feedback_worker = None
+
+
+def _post_feedback_webhook(webhook_url, data):
+    """POST one feedback payload, retrying failures with exponential backoff.
+
+    Args:
+        webhook_url: URL of the feedback webhook
+        data: JSON-encoded request body
+
+    Returns:
+        True if the webhook accepted the post, False if every attempt failed
+    """
+    for attempt in range(FEEDBACK_WEBHOOK_RETRIES):
+        if attempt:
+            time.sleep(2 ** (attempt - 1))
+        req = urllib.request.Request(
+            webhook_url,
+            data=data,
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=10):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def _feedback_webhook_worker():
+    """Send queued feedback posts forever, skipping repeats of the last post."""
+    last_post = None
+    last_time = 0.0
+    while True:
+        post = FEEDBACK_WEBHOOK_QUEUE.get()
+        now = time.monotonic()
+        if post != last_post or now - last_time >= FEEDBACK_DEDUPE_SECONDS:
+            if _post_feedback_webhook(*post):
+                last_post, last_time = post, now
+        FEEDBACK_WEBHOOK_QUEUE.task_done()
+
+
+def enqueue_feedback_webhook(webhook_url, data):
+    """Queue a feedback post for the webhook worker, starting it on first use.
+
+    Args:
+        webhook_url: URL of the feedback webhook
+        data: JSON-encoded request body
+
+    Raises:
+        ValueError: If the queue is full
+    """
+    global _feedback_worker
+    with _feedback_worker_lock:
+        if _feedback_worker is None:
+            _feedback_worker = threading.Thread(
+                target=_feedback_webhook_worker, name='feedback-webhook', daemon=True
+            )
+            _feedback_worker.start()
+    try:
+        FEEDBACK_WEBHOOK_QUEUE.put_nowait((webhook_url, data))
+    except queue.Full:
+        raise ValueError('Feedback queue is full') from None
+
+
+# Numeric query parameters of /calculate and /export_gdsii in CalcParams field
+# order: (name, default, minimum, maximum, range error). Fields without a
+# range error are not range checked.
+CALC_QUERY_FIELDS = (
+    ('wafer', '100', MIN_WAFER_DIAMETER, MAX_WAFER_DIAMETER, "Wafer diameter out of range"),
+    ('die_width', '10', MIN_DIE_SIZE, MAX_DIE_SIZE, "Die width out of range"),
+    ('die_height', '10', MIN_DIE_SIZE, MAX_DIE_SIZE, "Die height out of range"),
+    ('scribe', '0.1', 0, MAX_SCRIBE, "Scribe out of range"),
+    ('edge', '3', 0, MAX_EDGE_EXCLUSION, "Edge exclusion out of range"),
+    ('flat_length', '0', None, None, None),
+    ('notch_depth', '0', None, None, None),
+)
+
+# Checkbox query parameters as (name, default); a flag is set when its value is '1'
+CALC_QUERY_FLAGS = (
+    ('include_partial', '1'),
+    ('align_x', '0'),
+    ('align_y', '0'),
+)
+
+
+class CalcParams(NamedTuple):
+    """Validated calculation parameters parsed from a request query."""
+
+    wafer_diameter: float
+    die_width: float
+    die_height: float
+    scribe: float
+    edge_exclusion: float
+    flat_length: float
+    notch_depth: float
+    include_partial: bool
+    align_x: bool
+    align_y: bool
+
+    @classmethod
+    def from_query(cls, params):
+        """Parse and range check the calculation parameters of a query.
+
+        Args:
+            params: Dictionary of query parameter values by name
+
+        Returns:
+            CalcParams with missing parameters set to their defaults
+
+        Raises:
+            ValueError: If a value is not a number or is out of range
+        """
+        values = [
+            float(params.get(name, default))
+            for name, default, _, _, _ in CALC_QUERY_FIELDS
+        ]
+        wafer_diameter, die_width, die_height = values[:3]
+        if wafer_diameter <= 0 or die_width <= 0 or die_height <= 0:
+            raise ValueError("Dimensions must be positive")
+        for value, (_, _, minimum, maximum, message) in zip(values, CALC_QUERY_FIELDS):
+            if message and (value < minimum or value > maximum):
+                raise ValueError(message)
+        flags = [params.get(name, default) == '1' for name, default in CALC_QUERY_FLAGS]
+        return cls(*values, *flags)
+
+    def calculate(self, max_positions):
+        """Run calculate_dies for these parameters.
+
+        Args:
+            max_positions: Cap on returned die positions, or 0 for all
+
+        Returns:
+            Dictionary returned by calculate_dies
+        """
+        return calculate_dies(
+            *self[:len(CALC_QUERY_FIELDS)],
+            max_positions=max_positions,
+            include_partial=self.include_partial,
+            align_x=self.align_x,
+            align_y=self.align_y,
+        )
+
 
 class RequestHandler(BaseHTTPRequestHandler):
-    rate_limit = {}
+    # Per-client request counts, ordered by window start so expired records are
+    # always at the front and can be pruned without scanning the rest
+    rate_limit = collections.OrderedDict()
+    rate_limit_max_clients = 10000
+    # Requests are handled on concurrent threads, so the read-modify-write of
+    # a rate_limit record is done under this lock
+    rate_limit_lock = threading.Lock()
 
     def _rate_limited(self):
         ip = self.client_address[0]
         now = int(time.time())
         window = 60
         limit = 10
-        record = self.rate_limit.get(ip, {'start': now, 'count': 0})
-        if now - record['start'] >= window:
-            record = {'start': now, 'count': 0}
-        record['count'] += 1
-        self.rate_limit[ip] = record
+        with self.rate_limit_lock:
+            rate_limit = self.rate_limit
+            while rate_limit:
+                oldest = next(iter(rate_limit.values()))
+                if now - oldest['start'] < window and len(rate_limit) < self.rate_limit_max_clients:
+                    break
+                rate_limit.popitem(last=False)
+            record = rate_limit.get(ip)
+            if record is None:
+                record = rate_limit[ip] = {'start': now, 'count': 0}
+            record['count'] += 1
         return record['count'] > limit
+    def _accepts_gzip(self):
+        codings = self.headers.get('Accept-Encoding', '').split(',')
+        return any(coding.split(';')[0].strip().lower() == 'gzip' for coding in codings)
+
+    def _send_body(self, body):
+        """Finish the response headers and write the body.
+
+        Bodies of at least GZIP_MIN_SIZE bytes are gzip-compressed for clients
+        that accept it. The body is written in RESPONSE_WRITE_CHUNK slices of a
+        memoryview, so a large buffer is never copied.
+
+        Args:
+            body: Bytes-like response body
+        """
+        if len(body) >= GZIP_MIN_SIZE and self._accepts_gzip():
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        view = memoryview(body)
+        for start in range(0, len(view), RESPONSE_WRITE_CHUNK):
+            self.wfile.write(view[start:start + RESPONSE_WRITE_CHUNK])
+
     def _read_json_body(self):
         content_length = int(self.headers.get('Content-Length', 0))
         if content_length <= 0:
@@ -2602,113 +3453,48 @@ class RequestHandler(BaseHTTPRequestHandler):
 
         if parsed.path == '/':
             self.send_response(200)
-            self.send_header('Content-type', 'text/html')
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(HTML_PAGE)))
+            self.end_headers()
+            self.wfile.write(HTML_PAGE)
+
+        elif parsed.path in STATIC_ASSETS:
+            asset = STATIC_ASSETS[parsed.path]
+            self.send_response(200)
+            self.send_header('Content-type', asset['content_type'])
+            self.send_header('Content-Length', str(len(asset['body'])))
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
             self.end_headers()
-            self.wfile.write(HTML_TEMPLATE.encode())
+            self.wfile.write(asset['body'])
 
         elif parsed.path == '/calculate':
-            params = urllib.parse.parse_qs(parsed.query)
+            params = dict(urllib.parse.parse_qsl(parsed.query))
 
             try:
-                wafer_diameter = float(params.get('wafer', ['100'])[0])
-                die_width = float(params.get('die_width', ['10'])[0])
-                die_height = float(params.get('die_height', ['10'])[0])
-                scribe = float(params.get('scribe', ['0.1'])[0])
-                edge_exclusion = float(params.get('edge', ['3'])[0])
-                flat_length = float(params.get('flat_length', ['0'])[0])
-                notch_depth = float(params.get('notch_depth', ['0'])[0])
-
-                if wafer_diameter <= 0 or die_width <= 0 or die_height <= 0:
-                    raise ValueError("Dimensions must be positive")
-                if wafer_diameter < MIN_WAFER_DIAMETER or wafer_diameter > MAX_WAFER_DIAMETER:
-                    raise ValueError("Wafer diameter out of range")
-                if die_width < MIN_DIE_SIZE or die_width > MAX_DIE_SIZE:
-                    raise ValueError("Die width out of range")
-                if die_height < MIN_DIE_SIZE or die_height > MAX_DIE_SIZE:
-                    raise ValueError("Die height out of range")
-                if scribe < 0 or scribe > MAX_SCRIBE:
-                    raise ValueError("Scribe out of range")
-                if edge_exclusion < 0 or edge_exclusion > MAX_EDGE_EXCLUSION:
-                    raise ValueError("Edge exclusion out of range")
-
-                include_partial = params.get('include_partial', ['1'])[0] == '1'
-                align_x = params.get('align_x', ['0'])[0] == '1'
-                align_y = params.get('align_y', ['0'])[0] == '1'
-
-                result = calculate_dies(
-                    wafer_diameter,
-                    die_width,
-                    die_height,
-                    scribe,
-                    edge_exclusion,
-                    flat_length,
-                    notch_depth,
-                    max_positions=1200,
-                    include_partial=include_partial,
-                    align_x=align_x,
-                    align_y=align_y,
-                )
+                result = CalcParams.from_query(params).calculate(max_positions=1200)
 
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
+                self._send_body(encode_json(compact_die_positions(result)))
 
             except Exception as e:
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
+                self.wfile.write(encode_json({'error': str(e)}))
 
         elif parsed.path == '/export_gdsii':
-            params = urllib.parse.parse_qs(parsed.query)
+            params = dict(urllib.parse.parse_qsl(parsed.query))
 
             try:
-                wafer_diameter = float(params.get('wafer', ['100'])[0])
-                die_width = float(params.get('die_width', ['10'])[0])
-                die_height = float(params.get('die_height', ['10'])[0])
-                scribe = float(params.get('scribe', ['0.1'])[0])
-                edge_exclusion = float(params.get('edge', ['3'])[0])
-                flat_length = float(params.get('flat_length', ['0'])[0])
-                notch_depth = float(params.get('notch_depth', ['0'])[0])
-
-                if wafer_diameter <= 0 or die_width <= 0 or die_height <= 0:
-                    raise ValueError("Dimensions must be positive")
-                if wafer_diameter < MIN_WAFER_DIAMETER or wafer_diameter > MAX_WAFER_DIAMETER:
-                    raise ValueError("Wafer diameter out of range")
-                if die_width < MIN_DIE_SIZE or die_width > MAX_DIE_SIZE:
-                    raise ValueError("Die width out of range")
-                if die_height < MIN_DIE_SIZE or die_height > MAX_DIE_SIZE:
-                    raise ValueError("Die height out of range")
-                if scribe < 0 or scribe > MAX_SCRIBE:
-                    raise ValueError("Scribe out of range")
-                if edge_exclusion < 0 or edge_exclusion > MAX_EDGE_EXCLUSION:
-                    raise ValueError("Edge exclusion out of range")
-
-                include_partial = params.get('include_partial', ['1'])[0] == '1'
-                align_x = params.get('align_x', ['0'])[0] == '1'
-                align_y = params.get('align_y', ['0'])[0] == '1'
-
-                result = calculate_dies(
-                    wafer_diameter,
-                    die_width,
-                    die_height,
-                    scribe,
-                    edge_exclusion,
-                    flat_length,
-                    notch_depth,
-                    max_positions=0,
-                    include_partial=include_partial,
-                    align_x=align_x,
-                    align_y=align_y,
-                )
+                result = CalcParams.from_query(params).calculate(max_positions=0)
                 layer_config = {
-                    'wafer_layer': int(params.get('layer_wafer', ['0'])[0]),
-                    'wafer_datatype': int(params.get('datatype_wafer', ['0'])[0]),
-                    'usable_layer': int(params.get('layer_usable', ['1'])[0]),
-                    'usable_datatype': int(params.get('datatype_usable', ['0'])[0]),
-                    'die_layer': int(params.get('layer_die', ['2'])[0]),
-                    'die_datatype': int(params.get('datatype_die', ['0'])[0]),
+                    'wafer_layer': int(params.get('layer_wafer', '0')),
+                    'wafer_datatype': int(params.get('datatype_wafer', '0')),
+                    'usable_layer': int(params.get('layer_usable', '1')),
+                    'usable_datatype': int(params.get('datatype_usable', '0')),
+                    'die_layer': int(params.get('layer_die', '2')),
+                    'die_datatype': int(params.get('datatype_die', '0')),
                 }
 
                 gdsii_data = generate_gdsii(result, layer_config)
@@ -2716,15 +3502,13 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header('Content-type', 'application/octet-stream')
                 self.send_header('Content-Disposition', 'attachment; filename="wafer_layout.gds"')
-                self.send_header('Content-Length', str(len(gdsii_data)))
-                self.end_headers()
-                self.wfile.write(gdsii_data)
+                self._send_body(gdsii_data)
 
             except Exception as e:
                 self.send_response(400)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
+                self.wfile.write(encode_json({'error': str(e)}))
 
         else:
             self.send_response(404)
@@ -2761,15 +3545,7 @@ class RequestHandler(BaseHTTPRequestHandler):
                         f"Email: {entry['email'] or 'n/a'}\n"
                         f"Context: {json.dumps(entry['context'])}"
                     )
-                    data = json.dumps({'text': text}).encode('utf-8')
-                    req = urllib.request.Request(
-                        webhook_url,
-                        data=data,
-                        headers={'Content-Type': 'application/json'},
-                        method='POST',
-                    )
-                    with urllib.request.urlopen(req, timeout=10):
-                        pass
+                    enqueue_feedback_webhook(webhook_url, encode_json({'text': text}))
                 else:
                     feedback_path = os.environ.get('FEEDBACK_PATH', '/tmp/feedback.jsonl')
                     feedback_dir = os.path.dirname(feedback_path)
@@ -2781,12 +3557,12 @@ class RequestHandler(BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
-                self.wfile.write(json.dumps({'ok': True}).encode())
+                self.wfile.write(encode_json({'ok': True}))
             except Exception as e:
                 self.send_response(400)
                 self.send_header('Content-type', 'application/json')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': str(e)}).encode())
+                self.wfile.write(encode_json({'error': str(e)}))
             return
 
         self.send_response(404)
@@ -2798,7 +3574,7 @@ class RequestHandler(BaseHTTPRequestHandler):
 
 def main():
     port = int(os.environ.get('PORT', '5000'))
-    server = HTTPServer(('0.0.0.0', port), RequestHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', port), RequestHandler)
     print("Wafer Die Calculator running at:")
     print(f"  http://localhost:{port}")
     print("Press Ctrl+C to stop")